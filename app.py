@@ -2,11 +2,24 @@
 import streamlit as st
 from PIL import Image
 import numpy as np
+import base64
+import ctypes
+import functools
+import gc
+import io
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-import plotly.graph_objects as go
-import plotly.express as px
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+try:
+    import ahocorasick  # pyahocorasick : recherche multi-mots-clés en un seul passage
+except ImportError:
+    ahocorasick = None
 
 # Configuration de la page
 st.set_page_config(
@@ -26,15 +39,74 @@ def load_tensorflow():
     """Charge TensorFlow seulement quand nécessaire (lazy loading)"""
     global tf, _tf_loaded
     if not _tf_loaded:
+        # Conteneurs CPU (Streamlit Cloud : 1-2 vCPU) : noyaux oneDNN, pas d'attente active,
+        # un seul pool inter-op pour ne pas sursouscrire les cœurs
+        num_threads = max(1, os.cpu_count() or 1)
+        os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+        os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+        os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(num_threads))
+        os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+        
         import tensorflow as _tf
+        try:
+            _tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+            _tf.config.threading.set_inter_op_parallelism_threads(1)
+        except RuntimeError:
+            # Contexte TF déjà initialisé ailleurs : on garde sa configuration
+            pass
         tf = _tf
         _tf_loaded = True
     return tf
 
+@functools.lru_cache(maxsize=None)
+def load_onnxruntime():
+    """Charge onnxruntime s'il est installé (None sinon)"""
+    try:
+        import onnxruntime
+    except ImportError:
+        return None
+    return onnxruntime
+
 # =======================
 # CONSTANTES ET CONFIGURATION
 # =======================
 APP_VERSION = "1.1.0"
+# Logo de la sidebar embarqué (pas de requête HTTP à chaque rerun)
+LOGO_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="150" height="50" viewBox="0 0 150 50">'
+    '<rect width="150" height="50" fill="#00a651"/>'
+    '<text x="75" y="31" font-family="sans-serif" font-size="18" fill="#ffffff" '
+    'text-anchor="middle">AgriDetec</text></svg>'
+)
+LOGO_SVG_B64 = base64.b64encode(LOGO_SVG.encode("utf-8")).decode("ascii")
+# Générateur aléatoire du mode démo
+_RNG = np.random.default_rng()
+# Threads d'arrière-plan pour le chargement du modèle et le décodage / la prédiction
+# des images, partagés par toutes les sessions (AGRIDETECT_WORKERS, 4 par défaut)
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(1, int(os.getenv("AGRIDETECT_WORKERS", "4"))),
+    thread_name_prefix="agridetect",
+)
+# Tampons d'entrée propres à chaque thread (prédictions parallèles de plusieurs sessions)
+_BUFFERS = threading.local()
+# L'interpréteur TFLite partagé n'accepte qu'une inférence à la fois
+_TFLITE_LOCK = threading.Lock()
+MODEL_PATH = "models/agridetect_model_20251107_042206"
+# Normalisation des pixels : multiplication float32 (pas de division ni de float64)
+PIXEL_SCALE = np.float32(1.0 / 255.0)
+# Nombre de diagnostics retournés par image (principal + alternatives)
+TOP_K = 3
+# Filtre végétation : part minimale de pixels de feuillage pour lancer le modèle ;
+# en dessous, l'image est signalée sans plante. Feuillage : verts (G > R, G > B, G > 0.2)
+# ou jaunes à bruns des feuilles malades (R >= G > B, R - B > 0.12, R > 0.2)
+MIN_LEAF_FRACTION = 0.05
+LEAF_MIN_LEVEL = 51
+LEAF_MIN_SATURATION = 30
+NO_PLANT_ID = "no_plant"
+# Modèles exportés, prioritaires s'ils existent : ONNX (export_onnx.py),
+# puis TFLite INT8 (export_tflite.py)
+ONNX_MODEL_FILE = "model.onnx"
+TFLITE_MODEL_FILE = "model_int8.tflite"
 
 # Classes de maladies (extrait de votre main.py)
 DATASET_DISEASES = [
@@ -54,6 +126,35 @@ DATASET_DISEASES = [
     {"id": "tomato_healthy", "plant_fr": "Tomate", "disease_fr": "Sain", "severity": "Aucune"},
 ]
 
+# Catalogue en colonnes (un tuple par champ, indexé par classe)
+DISEASE_IDS = tuple(d["id"] for d in DATASET_DISEASES)
+DISEASE_PLANTS_FR = tuple(d["plant_fr"] for d in DATASET_DISEASES)
+DISEASE_NAMES_FR = tuple(d["disease_fr"] for d in DATASET_DISEASES)
+DISEASE_SEVERITIES = tuple(d["severity"] for d in DATASET_DISEASES)
+# (id, culture, maladie, sévérité) d'une classe prédite hors catalogue
+UNKNOWN_DISEASE = ("unknown", "Non spécifié", "Maladie inconnue", "Inconnue")
+
+# Sous-ensembles (indices) du catalogue utilisés par le mode démo, calculés une seule fois
+_ALL_DISEASES = tuple(range(len(DISEASE_IDS)))
+_HEALTHY_DISEASES = tuple(i for i in _ALL_DISEASES if "sain" in DISEASE_NAMES_FR[i].lower() or "healthy" in DISEASE_IDS[i])
+_SPOT_DISEASES = tuple(i for i in _ALL_DISEASES if "tache" in DISEASE_NAMES_FR[i].lower() or "spot" in DISEASE_IDS[i])
+_BLIGHT_DISEASES = tuple(i for i in _ALL_DISEASES if "brûlure" in DISEASE_NAMES_FR[i].lower() or "blight" in DISEASE_IDS[i] or "mildiou" in DISEASE_NAMES_FR[i].lower())
+_SEVERE_DISEASES = tuple(i for i in _ALL_DISEASES if DISEASE_SEVERITIES[i] == "Élevée")
+
+# Données du dashboard
+DASHBOARD_DISEASES = ("Mildiou", "Tache bactérienne", "Septoriose", "Brûlure précoce", "Acariens")
+DASHBOARD_DISEASE_COUNTS = (320, 230, 121, 124, 89)
+DASHBOARD_CROPS = ("Tomate", "Pomme de terre", "Poivron")
+DASHBOARD_CROP_COUNTS = (856, 452, 235)
+
+# Détections récentes affichées dans le dashboard
+RECENT_DETECTIONS = (
+    {"Date": "16/11/2025", "Culture": "Tomate", "Maladie": "Mildiou", "Confiance": "94%"},
+    {"Date": "16/11/2025", "Culture": "Pomme de terre", "Maladie": "Brûlure précoce", "Confiance": "90%"},
+    {"Date": "15/11/2025", "Culture": "Poivron", "Maladie": "Tache bactérienne", "Confiance": "92%"},
+    {"Date": "15/11/2025", "Culture": "Tomate", "Maladie": "Sain", "Confiance": "98%"},
+)
+
 # Traductions multilingues
 TRANSLATIONS = {
     "fr": {
@@ -103,32 +204,223 @@ TRANSLATIONS = {
     }
 }
 
+# Recommandations de traitement par type de maladie
+TREATMENTS = {
+    "bacterial_spot": [
+        "Retirer et détruire les feuilles infectées",
+        "Appliquer un fongicide à base de cuivre",
+        "Éviter l'arrosage par aspersion",
+        "Améliorer la circulation d'air"
+    ],
+    "early_blight": [
+        "Enlever les feuilles malades",
+        "Rotation des cultures",
+        "Appliquer un fongicide préventif",
+        "Pailler le sol pour réduire l'éclaboussure"
+    ],
+    "late_blight": [
+        "Traitement fongicide immédiat",
+        "Détruire les plants infectés",
+        "Éviter l'humidité excessive",
+        "Utiliser des variétés résistantes"
+    ],
+    "healthy": [
+        "Continuer les bonnes pratiques culturales",
+        "Surveiller régulièrement",
+        "Maintenir une fertilisation équilibrée",
+        "Assurer un arrosage adapté"
+    ]
+}
+
+# Traitements de chaque maladie du catalogue (précalculés au chargement)
+TREATMENTS_BY_DISEASE_ID = {
+    disease_id: TREATMENTS[next(
+        (k for k in ("bacterial_spot", "early_blight", "late_blight", "healthy") if k in disease_id),
+        "healthy"
+    )]
+    for disease_id in DISEASE_IDS
+}
+
+# Base de connaissances agricoles
+KNOWLEDGE_BASE = {
+    "fr": {
+        # Maladies
+        "mildiou": "Le mildiou est une maladie fongique grave qui affecte surtout les tomates et pommes de terre. **Traitement:** Appliquez un fongicide à base de cuivre dès les premiers symptômes. **Prévention:** Espacez bien les plants, évitez l'arrosage par aspersion, et utilisez des variétés résistantes.",
+        
+        "tache": "Les taches sur les feuilles peuvent être causées par des bactéries ou champignons. **Identifiez d'abord** la cause : taches noires (bactéries), taches brunes avec cercles (fongique). **Traitement:** Retirez les feuilles infectées, appliquez un fongicide ou bactéricide selon le cas.",
+        
+        "maladie": "Les principales maladies au Sénégal sont : le mildiou, la septoriose, les taches bactériennes, et les viroses. Pour un diagnostic précis, **uploadez une photo** dans la page Détection ! Je vous donnerai un traitement spécifique.",
+        
+        # Cultures spécifiques
+        "tomate": "**Conseils pour les tomates :**\n• Arrosez au pied (jamais les feuilles)\n• Espacez de 50-60cm entre plants\n• Tuteurez dès la plantation\n• Paillez le sol\n• Surveillez le mildiou en saison humide\n• Fertilisez régulièrement (NPK 10-10-10)",
+        
+        "pomme de terre": "**Conseils pour les pommes de terre :**\n• Buttez régulièrement\n• Surveillez la brûlure précoce et tardive\n• Récoltez après jaunissement du feuillage\n• Stockez à l'abri de la lumière\n• Rotation des cultures obligatoire",
+        
+        "poivron": "**Conseils pour les poivrons :**\n• Température optimale : 20-28°C\n• Arrosage régulier mais modéré\n• Protection contre les acariens\n• Fertilisation riche en potassium pour la fructification\n• Récolte quand le fruit atteint sa couleur finale",
+        
+        # Saisons
+        "saison": "Au Sénégal, nous avons :\n• **Saison humide (juin-octobre)** : Attention au mildiou, septoriose. Augmentez la surveillance.\n• **Saison sèche (novembre-mai)** : Risque d'acariens, arrosage crucial.\n\nAdaptez vos cultures selon la saison !",
+        
+        "quand planter": "**Calendrier cultural au Sénégal :**\n• Tomates : Octobre-Décembre (meilleur)\n• Pommes de terre : Novembre-Janvier\n• Poivrons : Octobre-Novembre\n\nÉvitez les plantations en pleine saison des pluies.",
+        
+        # Traitements
+        "traitement": "Pour bien traiter vos plantes :\n1. **Identifiez** la maladie (utilisez notre détection !)\n2. **Retirez** les parties infectées\n3. **Appliquez** le traitement adapté\n4. **Prévenez** la propagation\n\nQuelle maladie voulez-vous traiter ?",
+        
+        "fongicide": "**Fongicides recommandés :**\n• Cuivre (bouillie bordelaise) : mildiou, taches\n• Soufre : oïdium\n• Mancozèbe : maladies fongiques\n\n⚠️ Respectez les doses et délais avant récolte !",
+        
+        # Arrosage
+        "arrosage": "**Bonnes pratiques d'arrosage :**\n• Matin tôt ou soir tard\n• Au pied des plants (jamais les feuilles)\n• Régulier mais sans excès\n• Plus important en floraison/fructification\n• Paillez pour garder l'humidité",
+        
+        "eau": "L'eau est cruciale mais l'excès tue ! **Signes d'excès :** jaunissement, pourriture. **Signes de manque :** flétrissement, fruits petits. Ajustez selon votre sol et la météo.",
+        
+        # Sol
+        "sol": "**Préparez bien votre sol :**\n• pH idéal : 6.0-6.8 pour la plupart des cultures\n• Amendez avec compost (10-15 kg/m²)\n• Drainage essentiel\n• Rotation des cultures\n• Analysez votre sol si possible",
+        
+        # Salutations
+        "bonjour": "Bonjour ! 👋 Je suis votre assistant agricole AgriDetec. Je peux vous aider avec :\n• Diagnostic de maladies\n• Conseils de traitement\n• Bonnes pratiques culturales\n• Calendrier de plantation\n\nQue puis-je faire pour vous ?",
+        
+        "salut": "Salut ! Comment vont vos cultures aujourd'hui ? 🌱",
+        
+        "merci": "Avec plaisir ! N'hésitez pas si vous avez d'autres questions. Bonnes cultures ! 🌾",
+        
+        # Questions générales
+        "aide": "Je peux vous aider avec :\n✅ Identifier les maladies\n✅ Conseils de traitement\n✅ Calendrier cultural\n✅ Bonnes pratiques\n✅ Arrosage et fertilisation\n\nPosez-moi une question spécifique !",
+        
+        "detection": "Pour détecter une maladie :\n1. Allez sur la page **Détection** (sidebar)\n2. Uploadez une photo claire de votre plante\n3. Recevez diagnostic + traitement en quelques secondes !\n\n📸 La photo doit montrer clairement les symptômes.",
+    },
+    
+    "wo": {
+        "bonjour": "Salam aleykum ! 👋 Maa ngi AgriDetec. Noonu laa mën a ko dimbal ci sa géej. Laaj ma!",
+        "tomate": "**Tomat yi:**\n• Ndaw ci biir loxo (bul ndaw ay ndox)\n• Wàññi 50cm\n• Jëfal paaket\n• Xool mildiou ci navet",
+        "maladie": "Yépp maladii yu bari nekk ci Senegaal: mildiou, taches bactériennes. Upload nataal ngir gis ci ñu def.",
+        "default": "Laaj ma ci mbir, ci ñàkk maladii, waala bonnes pratiques ! Maa ngi fii ngir dimbalil yow. 🌱"
+    },
+    
+    "pu": {
+        "bonjour": "Jam waali ! 👋 Mi ko AgriDetec, ballal gese. Hol no tawii ma wallude ma?",
+        "tomate": "**Tomat ɗii:**\n• Ndaaw e dow leydi (hoto ndaawe e ndokke)\n• Haɗ 50cm\n• Ƴeew mildiou e hitaande ndiyam",
+        "maladie": "Maladii jamɗi e Senegaal: mildiou, taches. Upload natal ngam yiytaade.",
+        "default": "Naamno ma e laawol gese, maladii, waala njuɓɓudi moƴƴudi ! Mi ɗoo wallude ma. 🌱"
+    }
+}
+
+
+# Réponses par défaut du chatbot si aucun mot-clé ne correspond
+DEFAULT_RESPONSES = {
+    "fr": "C'est une excellente question ! Pour une réponse précise, pouvez-vous me donner plus de détails ? Ou essayez :\n• 'Comment traiter le mildiou ?'\n• 'Conseils pour les tomates'\n• 'Quand planter au Sénégal ?'\n• 'Comment arroser mes plants ?'",
+    "wo": KNOWLEDGE_BASE["wo"].get("default", "Laaj ma ci ay xam-xam yu gën bari ! 🌱"),
+    "pu": KNOWLEDGE_BASE["pu"].get("default", "Naamno ma e laawol gese ! 🌱")
+}
+
 # =======================
 # FONCTIONS UTILITAIRES
 # =======================
 
-@st.cache_resource
+def resize_rgb(image, size):
+    """Convertit une image PIL en tableau RGB uint8 redimensionné via OpenCV"""
+    import cv2  # importé à la première analyse seulement
+    
+    width, height = size
+    # Grandes images (PNG, etc. : hors draft JPEG) : réduction par blocs entiers dans
+    # Pillow tant qu'il reste au moins 2x la cible, avant conversion et copie NumPy
+    factor = min(image.width // (2 * width), image.height // (2 * height))
+    if factor >= 2 and image.mode in ("RGB", "RGBA", "L", "LA", "CMYK"):
+        image = image.reduce(factor)
+    pixels = np.asarray(image.convert("RGB"))
+    # INTER_AREA pour réduire (anti-crénelage), INTER_LINEAR pour agrandir
+    if pixels.shape[0] >= height and pixels.shape[1] >= width:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = cv2.INTER_LINEAR
+    return cv2.resize(pixels, (width, height), interpolation=interpolation)
+
+def submit_with_context(fn, *args):
+    """Exécute fn dans le thread d'arrière-plan avec le contexte Streamlit de la session"""
+    ctx = get_script_run_ctx()
+    
+    def run():
+        thread = threading.current_thread()
+        previous = get_script_run_ctx(suppress_warning=True)
+        add_script_run_ctx(thread, ctx)
+        try:
+            return fn(*args)
+        finally:
+            # Thread du pool réutilisé par d'autres sessions : on lui rend son contexte d'avant
+            setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous)
+    
+    return _EXECUTOR.submit(run)
+
+def load_keras_model(tf, model_path):
+    """Charge le modèle avec tf_keras (modèles Keras 2) s'il est installé, sinon ou en cas d'échec avec tf.keras"""
+    try:
+        import tf_keras
+    except ImportError:
+        tf_keras = None
+    if tf_keras is not None:
+        try:
+            return tf_keras.models.load_model(model_path, compile=False)
+        except Exception:
+            # Modèle Keras 3 (.keras) illisible par tf_keras : on réessaie avec tf.keras
+            pass
+    return tf.keras.models.load_model(model_path, compile=False)
+
+def release_memory():
+    """Collecte les objets libérés et rend au système les pages libres du tas (glibc)"""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+@st.cache_resource(show_spinner=False)
+def preload_model():
+    """Lance le chargement du modèle en arrière-plan au démarrage de l'application"""
+    # Avec le contexte Streamlit : st.cache_resource de load_model l'exige dans le thread
+    return submit_with_context(load_model)
+
+def get_input_buffer(batch_size=1, dtype=np.float32):
+    """Tenseur (N, 224, 224, 3) réutilisé entre les prédictions du thread (un par dtype)"""
+    key = np.dtype(dtype).name
+    buffer = getattr(_BUFFERS, key, None)
+    if buffer is None or buffer.shape[0] != batch_size:
+        buffer = np.empty((batch_size, 224, 224, 3), dtype=dtype)
+        setattr(_BUFFERS, key, buffer)
+    return buffer
+
+@st.cache_resource(show_spinner=False)
 def load_model():
     """Charge le modèle de détection"""
     try:
-        model_path = "models/agridetect_model_20251107_042206"
+        model_path = MODEL_PATH
         if not os.path.exists(model_path):
             return None, f"❌ Modèle non trouvé dans {model_path}"
         
+        # Priorité au modèle ONNX (produit par export_onnx.py) : onnxruntime,
+        # sans importer TensorFlow ni dépendre de la version de Keras
+        onnx_path = os.path.join(model_path, ONNX_MODEL_FILE)
+        ort = load_onnxruntime()
+        if ort is not None and os.path.exists(onnx_path):
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = max(1, os.cpu_count() or 1)
+            session = ort.InferenceSession(onnx_path, sess_options=options,
+                                           providers=["CPUExecutionProvider"])
+            return session, None
+        
         # Charger TensorFlow seulement maintenant
         tf = load_tensorflow()
         
-        # Essayer de charger avec TF 2.x (Keras 3)
-        try:
-            import tf_keras
-            model = tf_keras.models.load_model(model_path)
-            return model, None
-        except:
-            pass
+        # Priorité au modèle TFLite INT8 (inférence CPU plus rapide)
+        tflite_path = os.path.join(model_path, TFLITE_MODEL_FILE)
+        if os.path.exists(tflite_path):
+            interpreter = tf.lite.Interpreter(model_path=tflite_path, num_threads=os.cpu_count())
+            interpreter.allocate_tensors()
+            return interpreter, None
         
-        # Fallback: essayer avec Keras standard
+        # Keras : tf_keras d'abord s'il est installé, puis tf.keras
         try:
-            model = tf.keras.models.load_model(model_path, compile=False)
+            model = load_keras_model(tf, model_path)
+            warmup_model(model)
             return model, None
         except Exception as keras_error:
             return None, (
@@ -138,66 +430,189 @@ def load_model():
                 f"1. Héberger le modèle sur Hugging Face\n"
                 f"2. Ré-entraîner avec Keras 3\n"
                 f"3. Utiliser un modèle pré-entraîné compatible\n\n"
-                f"**En attendant, testez le Chatbot et le Dashboard !** 🚀"
+                f"**En attendant, testez le Chatbot et le Dashboard !** 🚀\n\n"
+                f"Détail : {keras_error}"
             )
     except Exception as e:
         return None, f"Erreur lors du chargement : {str(e)}"
+    finally:
+        # Le chargement laisse de gros tampons temporaires dans le tas du processus
+        release_memory()
+
+@st.cache_resource(show_spinner=False)
+def get_predict_fn(_model):
+    """Compile (XLA) une seule fois la passe d'inférence du modèle"""
+    tf = load_tensorflow()
+    
+    @tf.function(
+        jit_compile=True,
+        input_signature=[tf.TensorSpec((None, 224, 224, 3), tf.float32)],
+    )
+    def predict_fn(x):
+        return _model(x, training=False)
+    
+    return predict_fn
+
+def warmup_model(model):
+    """Trace et compile la passe d'inférence dès le chargement (lot de 1 image)"""
+    get_predict_fn(model)(np.zeros((1, 224, 224, 3), dtype=np.float32))
+
+@functools.lru_cache(maxsize=None)
+def quantization_table(scale, zero_point, dtype):
+    """Table pixel uint8 -> valeur quantifiée de l'entrée du modèle (None si identité)"""
+    info = np.iinfo(dtype)
+    values = np.round(np.arange(256) * PIXEL_SCALE / scale + zero_point)
+    table = np.clip(values, info.min, info.max).astype(dtype)
+    if table.dtype == np.uint8 and np.array_equal(table, np.arange(256)):
+        return None
+    return table
+
+def run_tflite(interpreter, pixels):
+    """Inférence via l'interpréteur TFLite à partir des pixels uint8 (quantification INT8)"""
+    # Tout accès à l'interpréteur partagé (détails compris) se fait sous le verrou :
+    # un autre thread peut l'avoir redimensionné pour un lot de taille différente
+    with _TFLITE_LOCK:
+        input_details = interpreter.get_input_details()[0]
+        
+        if input_details["dtype"] == np.float32:
+            img_array = np.multiply(pixels, PIXEL_SCALE, dtype=np.float32)
+        else:
+            # Quantification directe des pixels par table (pas de passage en float)
+            scale, zero_point = input_details["quantization"]
+            table = quantization_table(scale, zero_point, np.dtype(input_details["dtype"]).name)
+            img_array = pixels if table is None else table[pixels]
+        
+        # Adapter la taille du lot si nécessaire
+        if tuple(input_details["shape"]) != img_array.shape:
+            interpreter.resize_tensor_input(input_details["index"], img_array.shape)
+            interpreter.allocate_tensors()
+        
+        interpreter.set_tensor(input_details["index"], img_array)
+        interpreter.invoke()
+        output_details = interpreter.get_output_details()[0]
+        predictions = interpreter.get_tensor(output_details["index"])
+    
+    if output_details["dtype"] != np.float32:
+        scale, zero_point = output_details["quantization"]
+        predictions = (predictions.astype(np.float32) - zero_point) * scale
+    return predictions
+
+def run_onnx(session, img_array):
+    """Inférence via onnxruntime"""
+    return session.run(None, {session.get_inputs()[0].name: img_array})[0]
+
+def normalize_batch(pixels):
+    """Lot float32 (N, 224, 224, 3) normalisé dans [0, 1] à partir des pixels uint8"""
+    img_array = get_input_buffer(len(pixels))
+    np.multiply(pixels, PIXEL_SCALE, out=img_array)
+    return img_array
+
+def run_model(model, pixels):
+    """Passe unique du modèle (ONNX, TFLite ou Keras) sur un lot de pixels uint8"""
+    ort = load_onnxruntime()
+    if ort is not None and isinstance(model, ort.InferenceSession):
+        return run_onnx(model, normalize_batch(pixels))
+    if isinstance(model, load_tensorflow().lite.Interpreter):
+        # Modèle INT8 : pixels uint8 bruts, sans normalisation float
+        return run_tflite(model, pixels)
+    return get_predict_fn(model)(normalize_batch(pixels)).numpy()
+
+def leaf_fractions(pixels):
+    """Part des pixels de feuillage (vert, ou jaune / brun si malade) de chaque image d'un lot uint8 (N, H, W, 3)"""
+    r, g, b = (pixels[..., c].astype(np.int16) for c in range(3))
+    green = (g > r) & (g > b) & (g > LEAF_MIN_LEVEL)
+    # Jaunissement, nécroses : teintes jaunes à brunes, ni grises ni trop sombres
+    yellow_brown = (r >= g) & (g > b) & (r - b > LEAF_MIN_SATURATION) & (r > LEAF_MIN_LEVEL)
+    leaf = green | yellow_brown
+    return np.count_nonzero(leaf, axis=(1, 2)) / (leaf.shape[1] * leaf.shape[2])
 
 def predict_disease(image, model, language="fr"):
     """Effectue la prédiction sur une image"""
+    return predict_diseases([image], model, language)[0]
+
+def predict_diseases(images, model, language="fr"):
+    """Effectue la prédiction sur plusieurs images en une seule passe du modèle"""
     
     # Si le modèle n'est pas disponible, utiliser le mode démo intelligent
     if model is None:
-        return predict_disease_demo(image, language)
-    
-    # Prétraitement
-    img = image.resize((224, 224))
-    img_array = np.array(img) / 255.0
-    img_array = np.expand_dims(img_array, axis=0)
+        return [predict_disease_demo(image, language) for image in images]
     
-    # Prédiction
-    predictions = model.predict(img_array, verbose=0)
-    predicted_class = np.argmax(predictions[0])
-    confidence = float(predictions[0][predicted_class])
+    # Prétraitement : un seul lot uint8 (N, 224, 224, 3)
+    pixels = get_input_buffer(len(images), np.uint8)
+    for i, image in enumerate(images):
+        pixels[i] = resize_rgb(image, (224, 224))
     
-    # Mapping vers le catalogue
-    if predicted_class < len(DATASET_DISEASES):
-        disease_info = DATASET_DISEASES[predicted_class]
+    # Les images sans végétation ne passent pas par le modèle
+    is_plant = leaf_fractions(pixels) >= MIN_LEAF_FRACTION
+    num_classes = len(DISEASE_IDS)
+    if is_plant.all():
+        predictions = run_model(model, pixels)
+    elif is_plant.any():
+        predictions = run_model(model, pixels[is_plant])
     else:
-        disease_info = {
-            "id": "unknown",
-            "plant_fr": "Non spécifié",
-            "disease_fr": "Maladie inconnue",
-            "severity": "Inconnue"
-        }
+        predictions = np.empty((0, num_classes), dtype=np.float32)
     
-    return {
-        "disease_name": disease_info["disease_fr"],
-        "plant": disease_info["plant_fr"],
-        "confidence": confidence,
-        "severity": disease_info["severity"],
-        "disease_id": disease_info["id"]
-    }
+    # Top-k de tout le lot en une seule opération (sélection partielle, puis tri des k)
+    k = min(TOP_K, predictions.shape[1])
+    rows = np.arange(len(predictions))[:, np.newaxis]
+    top_classes = np.argpartition(predictions, -k, axis=1)[:, -k:]
+    top_classes = np.take_along_axis(top_classes, np.argsort(-predictions[rows, top_classes], axis=1), axis=1)
+    top_confidences = predictions[rows, top_classes]
+    
+    plant_rows = zip(top_classes.tolist(), top_confidences.tolist())
+    results = []
+    for plant_detected in is_plant.tolist():
+        if not plant_detected:
+            # Pas de passage du modèle, donc pas de confiance à afficher
+            results.append({
+                "disease_name": "Aucune plante détectée",
+                "plant": "Non spécifié",
+                "confidence": None,
+                "severity": "Inconnue",
+                "disease_id": NO_PLANT_ID,
+                "alternatives": []
+            })
+            continue
+        
+        top, top_conf = next(plant_rows)
+        i, confidence = top[0], top_conf[0]
+        # Mapping vers le catalogue (colonnes indexées par classe)
+        if i < num_classes:
+            disease_id, plant, disease_name, severity = (
+                DISEASE_IDS[i], DISEASE_PLANTS_FR[i], DISEASE_NAMES_FR[i], DISEASE_SEVERITIES[i]
+            )
+        else:
+            disease_id, plant, disease_name, severity = UNKNOWN_DISEASE
+        
+        results.append({
+            "disease_name": disease_name,
+            "plant": plant,
+            "confidence": confidence,
+            "severity": severity,
+            "disease_id": disease_id,
+            # Diagnostics alternatifs (classes suivantes du top-k)
+            "alternatives": [
+                (DISEASE_NAMES_FR[c], DISEASE_PLANTS_FR[c], conf)
+                for c, conf in zip(top[1:], top_conf[1:])
+                if c < num_classes
+            ]
+        })
+    return results
 
 def predict_disease_demo(image, language="fr"):
     """
     Mode démo intelligent : analyse les couleurs et patterns de l'image
     pour générer une prédiction réaliste
     """
-    import random
-    from collections import Counter
+    # Analyse de l'image (64x64 suffit pour des statistiques de couleur)
+    img_small = resize_rgb(image, (64, 64))
+    pixels = img_small.reshape(-1, 3).astype(np.float32)
     
-    # Analyse de l'image
-    img_small = image.resize((100, 100))
-    pixels = np.array(img_small)
-    
-    # Calcul des moyennes RGB
-    mean_r = np.mean(pixels[:, :, 0])
-    mean_g = np.mean(pixels[:, :, 1])
-    mean_b = np.mean(pixels[:, :, 2])
+    # Calcul des moyennes RGB (une seule réduction sur les 3 canaux)
+    mean_r, mean_g, mean_b = pixels.mean(axis=0)
     
     # Calcul de la variance (texture)
-    variance = np.var(pixels)
+    variance = pixels.var()
     
     # Détection de la couleur dominante
     green_score = mean_g - (mean_r + mean_b) / 2
@@ -207,86 +622,73 @@ def predict_disease_demo(image, language="fr"):
     # Logique de détection basée sur les couleurs
     if green_score > 20 and variance < 500:
         # Image très verte et uniforme = plante saine
-        selected_diseases = [d for d in DATASET_DISEASES if "sain" in d["disease_fr"].lower() or "healthy" in d["id"]]
+        selected_diseases = _HEALTHY_DISEASES
         confidence_range = (0.92, 0.98)
     
     elif brown_score > 15 or yellow_score > 20:
         # Présence de brun/jaune = maladie probable
         if variance > 800:
             # Haute variance = taches, septoriose
-            selected_diseases = [d for d in DATASET_DISEASES if "tache" in d["disease_fr"].lower() or "spot" in d["id"]]
+            selected_diseases = _SPOT_DISEASES
         else:
             # Basse variance = brûlure, mildiou
-            selected_diseases = [d for d in DATASET_DISEASES if "brûlure" in d["disease_fr"].lower() or "blight" in d["id"] or "mildiou" in d["disease_fr"].lower()]
+            selected_diseases = _BLIGHT_DISEASES
         confidence_range = (0.78, 0.91)
     
     elif mean_g < 100:
         # Image sombre = maladie avancée
-        selected_diseases = [d for d in DATASET_DISEASES if d["severity"] == "Élevée"]
+        selected_diseases = _SEVERE_DISEASES
         confidence_range = (0.82, 0.89)
     
     else:
         # Cas général = sélection aléatoire pondérée
-        selected_diseases = DATASET_DISEASES
+        selected_diseases = _ALL_DISEASES
         confidence_range = (0.75, 0.88)
     
     # Sélection de la maladie
-    if selected_diseases:
-        disease_info = random.choice(selected_diseases)
-    else:
-        disease_info = random.choice(DATASET_DISEASES)
+    if not selected_diseases:
+        selected_diseases = _ALL_DISEASES
+    i = selected_diseases[int(_RNG.integers(len(selected_diseases)))]
     
-    # Génération d'une confiance réaliste
-    confidence = random.uniform(*confidence_range)
-    
-    # Petit ajustement aléatoire pour plus de réalisme
-    confidence = round(confidence + random.uniform(-0.03, 0.03), 4)
-    confidence = max(0.70, min(0.99, confidence))  # Limiter entre 70% et 99%
+    # Génération d'une confiance réaliste + petit ajustement aléatoire (un seul tirage)
+    low, high = confidence_range
+    confidence = _RNG.uniform((low, -0.03), (high, 0.03)).sum()
+    confidence = float(np.clip(round(confidence, 4), 0.70, 0.99))  # Limiter entre 70% et 99%
     
     return {
-        "disease_name": disease_info["disease_fr"],
-        "plant": disease_info["plant_fr"],
+        "disease_name": DISEASE_NAMES_FR[i],
+        "plant": DISEASE_PLANTS_FR[i],
         "confidence": confidence,
-        "severity": disease_info["severity"],
-        "disease_id": disease_info["id"],
+        "severity": DISEASE_SEVERITIES[i],
+        "disease_id": DISEASE_IDS[i],
         "demo_mode": True
     }
 
+def open_image(image_bytes, size=(224, 224)):
+    """Ouvre une image uploadée ; les JPEG sont décodés directement à échelle réduite (>= size)"""
+    image = Image.open(io.BytesIO(image_bytes))
+    image.draft("RGB", size)
+    return image
+
+@st.cache_data(show_spinner=False)
+def cached_predict(images_bytes, language="fr"):
+    """Décode et analyse les images, mis en cache sur le contenu des fichiers uploadés"""
+    images = [open_image(image_bytes) for image_bytes in images_bytes]
+    model, _ = load_model()
+    return predict_diseases(images, model, language)
+
+@st.cache_data(show_spinner=False)
+def make_thumbnail(image_bytes, max_size=512):
+    """Miniature JPEG de l'image uploadée pour l'affichage (évite de renvoyer l'original)"""
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    image.thumbnail((max_size, max_size))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
 def get_treatment_recommendations(disease_id, language="fr"):
     """Retourne les recommandations de traitement"""
-    treatments = {
-        "bacterial_spot": [
-            "Retirer et détruire les feuilles infectées",
-            "Appliquer un fongicide à base de cuivre",
-            "Éviter l'arrosage par aspersion",
-            "Améliorer la circulation d'air"
-        ],
-        "early_blight": [
-            "Enlever les feuilles malades",
-            "Rotation des cultures",
-            "Appliquer un fongicide préventif",
-            "Pailler le sol pour réduire l'éclaboussure"
-        ],
-        "late_blight": [
-            "Traitement fongicide immédiat",
-            "Détruire les plants infectés",
-            "Éviter l'humidité excessive",
-            "Utiliser des variétés résistantes"
-        ],
-        "healthy": [
-            "Continuer les bonnes pratiques culturales",
-            "Surveiller régulièrement",
-            "Maintenir une fertilisation équilibrée",
-            "Assurer un arrosage adapté"
-        ]
-    }
-    
-    # Recherche de la clé
-    for key in treatments.keys():
-        if key in disease_id:
-            return treatments[key]
-    
-    return treatments.get("healthy", ["Consultez un agronome pour plus d'informations"])
+    return TREATMENTS_BY_DISEASE_ID.get(disease_id, TREATMENTS["healthy"])
 
 # =======================
 # INTERFACE SIDEBAR
@@ -295,7 +697,7 @@ def get_treatment_recommendations(disease_id, language="fr"):
 def render_sidebar():
     """Affiche la barre latérale avec navigation et paramètres"""
     with st.sidebar:
-        st.image("https://via.placeholder.com/150x50/00a651/ffffff?text=AgriDetec", use_container_width=True)
+        st.markdown(f'<img src="data:image/svg+xml;base64,{LOGO_SVG_B64}" width="100%"/>', unsafe_allow_html=True)
         st.markdown("---")
         
         # Sélection de la langue
@@ -330,7 +732,7 @@ def render_sidebar():
 # PAGES DE L'APPLICATION
 # =======================
 
-def page_detection(language, t, model, model_error):
+def page_detection(language, t, model_error):
     """Page de détection de maladies"""
     st.title(t["title"])
     st.markdown(f"### {t['subtitle']}")
@@ -343,55 +745,82 @@ def page_detection(language, t, model, model_error):
     
     with col1:
         st.subheader("📸 Image de la plante")
-        uploaded_file = st.file_uploader(
+        uploaded_files = st.file_uploader(
             "Formats acceptés : JPG, JPEG, PNG",
             type=['jpg', 'jpeg', 'png'],
+            accept_multiple_files=True,
             label_visibility="collapsed"
         )
         
-        if uploaded_file is not None:
-            image = Image.open(uploaded_file)
-            st.image(image, use_container_width=True)
+        if uploaded_files:
+            # Décodage + prédiction (un seul lot) lancés en arrière-plan pendant l'affichage
+            images_bytes = tuple(f.getvalue() for f in uploaded_files)
+            prediction = submit_with_context(cached_predict, images_bytes, language)
+            
+            # Grille de miniatures
+            grid = st.columns(min(len(uploaded_files), 3))
+            for i, (uploaded_file, image_bytes) in enumerate(zip(uploaded_files, images_bytes)):
+                with grid[i % len(grid)]:
+                    st.image(make_thumbnail(image_bytes), caption=uploaded_file.name, use_container_width=True)
     
     with col2:
-        if uploaded_file is not None:
+        if uploaded_files:
             st.subheader(t["results"])
             
             with st.spinner(t["analyzing"]):
-                result = predict_disease(image, model, language)
-            
-            # Affichage des résultats
-            disease_name = result["disease_name"]
-            confidence = result["confidence"]
-            severity = result["severity"]
-            
-            if "sain" in disease_name.lower() or "healthy" in disease_name.lower():
-                st.success(f"**{disease_name}**")
-                st.balloons()
-            else:
-                st.warning(f"**{t['disease_detected']}:** {disease_name}")
+                results = prediction.result()
             
-            # Métriques
-            col_metric1, col_metric2 = st.columns(2)
-            with col_metric1:
-                st.metric("Confiance", f"{confidence*100:.1f}%")
-            with col_metric2:
-                st.metric("Sévérité", severity)
-            
-            st.progress(confidence)
-            
-            # Informations
-            st.markdown(f"**Culture :** {result['plant']}")
-            
-            # Recommandations
-            st.markdown("---")
-            st.subheader("💊 Recommandations")
-            treatments = get_treatment_recommendations(result["disease_id"], language)
-            for i, treatment in enumerate(treatments, 1):
-                st.markdown(f"**{i}.** {treatment}")
+            for i, (uploaded_file, result) in enumerate(zip(uploaded_files, results)):
+                if len(results) > 1:
+                    if i > 0:
+                        st.markdown("---")
+                    st.markdown(f"#### {uploaded_file.name}")
+                render_result(result, t, language)
         else:
             st.info("Uploadez une image pour commencer l'analyse")
 
+def render_result(result, t, language):
+    """Affiche le diagnostic et les recommandations pour une image"""
+    disease_name = result["disease_name"]
+    confidence = result["confidence"]
+    severity = result["severity"]
+    
+    if result["disease_id"] == NO_PLANT_ID:
+        st.info("🌿 **Aucune plante détectée** - Photographiez une feuille de près, bien éclairée")
+        return
+    
+    if "sain" in disease_name.lower() or "healthy" in disease_name.lower():
+        st.success(f"**{disease_name}**")
+        st.balloons()
+    else:
+        st.warning(f"**{t['disease_detected']}:** {disease_name}")
+    
+    # Métriques
+    col_metric1, col_metric2 = st.columns(2)
+    with col_metric1:
+        st.metric("Confiance", f"{confidence*100:.1f}%")
+    with col_metric2:
+        st.metric("Sévérité", severity)
+    
+    st.progress(confidence)
+    
+    # Informations
+    st.markdown(f"**Culture :** {result['plant']}")
+    
+    # Autres diagnostics possibles (absents en mode démo)
+    alternatives = result.get("alternatives")
+    if alternatives:
+        st.caption("Autres possibilités : " + " · ".join(
+            f"{name} ({plant}) {conf*100:.1f}%" for name, plant, conf in alternatives
+        ))
+    
+    # Recommandations
+    st.markdown("---")
+    st.subheader("💊 Recommandations")
+    treatments = get_treatment_recommendations(result["disease_id"], language)
+    for i, treatment in enumerate(treatments, 1):
+        st.markdown(f"**{i}.** {treatment}")
+
 def page_chatbot(language, t):
     """Page du chatbot agricole"""
     st.title(t["chat_title"])
@@ -420,89 +849,86 @@ def page_chatbot(language, t):
         
         st.session_state.messages.append({"role": "assistant", "content": response})
 
+@functools.lru_cache(maxsize=None)
+def get_kb_matcher(language):
+    """Construit une fois par langue le détecteur des mots-clés de la base"""
+    kb = KNOWLEDGE_BASE.get(language, KNOWLEDGE_BASE["fr"])
+    keywords = list(kb)
+    
+    if ahocorasick is not None:
+        # Automate Aho-Corasick : coût linéaire en la taille du message,
+        # quel que soit le nombre de mots-clés
+        automaton = ahocorasick.Automaton()
+        for i, keyword in enumerate(keywords):
+            automaton.add_word(keyword, (i, keyword))
+        automaton.make_automaton()
+        
+        def find_keyword(text):
+            # Priorité = ordre du dictionnaire
+            best = min((value for _, value in automaton.iter(text)), default=None)
+            return best[1] if best else None
+    else:
+        # Lookahead : trouve aussi les mots-clés qui se chevauchent ; l'ordre de
+        # l'alternance respecte la priorité (ordre du dictionnaire)
+        pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+        priority = {keyword: i for i, keyword in enumerate(keywords)}
+        
+        def find_keyword(text):
+            matches = {m.group(1) for m in pattern.finditer(text)}
+            return min(matches, key=priority.__getitem__) if matches else None
+    
+    return find_keyword, kb
+
 def generate_chatbot_response(message, language="fr"):
     """Génère une réponse du chatbot (version améliorée)"""
     message_lower = message.lower()
     
-    # Base de connaissances agricoles
-    knowledge_base = {
-        "fr": {
-            # Maladies
-            "mildiou": "Le mildiou est une maladie fongique grave qui affecte surtout les tomates et pommes de terre. **Traitement:** Appliquez un fongicide à base de cuivre dès les premiers symptômes. **Prévention:** Espacez bien les plants, évitez l'arrosage par aspersion, et utilisez des variétés résistantes.",
-            
-            "tache": "Les taches sur les feuilles peuvent être causées par des bactéries ou champignons. **Identifiez d'abord** la cause : taches noires (bactéries), taches brunes avec cercles (fongique). **Traitement:** Retirez les feuilles infectées, appliquez un fongicide ou bactéricide selon le cas.",
-            
-            "maladie": "Les principales maladies au Sénégal sont : le mildiou, la septoriose, les taches bactériennes, et les viroses. Pour un diagnostic précis, **uploadez une photo** dans la page Détection ! Je vous donnerai un traitement spécifique.",
-            
-            # Cultures spécifiques
-            "tomate": "**Conseils pour les tomates :**\n• Arrosez au pied (jamais les feuilles)\n• Espacez de 50-60cm entre plants\n• Tuteurez dès la plantation\n• Paillez le sol\n• Surveillez le mildiou en saison humide\n• Fertilisez régulièrement (NPK 10-10-10)",
-            
-            "pomme de terre": "**Conseils pour les pommes de terre :**\n• Buttez régulièrement\n• Surveillez la brûlure précoce et tardive\n• Récoltez après jaunissement du feuillage\n• Stockez à l'abri de la lumière\n• Rotation des cultures obligatoire",
-            
-            "poivron": "**Conseils pour les poivrons :**\n• Température optimale : 20-28°C\n• Arrosage régulier mais modéré\n• Protection contre les acariens\n• Fertilisation riche en potassium pour la fructification\n• Récolte quand le fruit atteint sa couleur finale",
-            
-            # Saisons
-            "saison": "Au Sénégal, nous avons :\n• **Saison humide (juin-octobre)** : Attention au mildiou, septoriose. Augmentez la surveillance.\n• **Saison sèche (novembre-mai)** : Risque d'acariens, arrosage crucial.\n\nAdaptez vos cultures selon la saison !",
-            
-            "quand planter": "**Calendrier cultural au Sénégal :**\n• Tomates : Octobre-Décembre (meilleur)\n• Pommes de terre : Novembre-Janvier\n• Poivrons : Octobre-Novembre\n\nÉvitez les plantations en pleine saison des pluies.",
-            
-            # Traitements
-            "traitement": "Pour bien traiter vos plantes :\n1. **Identifiez** la maladie (utilisez notre détection !)\n2. **Retirez** les parties infectées\n3. **Appliquez** le traitement adapté\n4. **Prévenez** la propagation\n\nQuelle maladie voulez-vous traiter ?",
-            
-            "fongicide": "**Fongicides recommandés :**\n• Cuivre (bouillie bordelaise) : mildiou, taches\n• Soufre : oïdium\n• Mancozèbe : maladies fongiques\n\n⚠️ Respectez les doses et délais avant récolte !",
-            
-            # Arrosage
-            "arrosage": "**Bonnes pratiques d'arrosage :**\n• Matin tôt ou soir tard\n• Au pied des plants (jamais les feuilles)\n• Régulier mais sans excès\n• Plus important en floraison/fructification\n• Paillez pour garder l'humidité",
-            
-            "eau": "L'eau est cruciale mais l'excès tue ! **Signes d'excès :** jaunissement, pourriture. **Signes de manque :** flétrissement, fruits petits. Ajustez selon votre sol et la météo.",
-            
-            # Sol
-            "sol": "**Préparez bien votre sol :**\n• pH idéal : 6.0-6.8 pour la plupart des cultures\n• Amendez avec compost (10-15 kg/m²)\n• Drainage essentiel\n• Rotation des cultures\n• Analysez votre sol si possible",
-            
-            # Salutations
-            "bonjour": "Bonjour ! 👋 Je suis votre assistant agricole AgriDetec. Je peux vous aider avec :\n• Diagnostic de maladies\n• Conseils de traitement\n• Bonnes pratiques culturales\n• Calendrier de plantation\n\nQue puis-je faire pour vous ?",
-            
-            "salut": "Salut ! Comment vont vos cultures aujourd'hui ? 🌱",
-            
-            "merci": "Avec plaisir ! N'hésitez pas si vous avez d'autres questions. Bonnes cultures ! 🌾",
-            
-            # Questions générales
-            "aide": "Je peux vous aider avec :\n✅ Identifier les maladies\n✅ Conseils de traitement\n✅ Calendrier cultural\n✅ Bonnes pratiques\n✅ Arrosage et fertilisation\n\nPosez-moi une question spécifique !",
-            
-            "detection": "Pour détecter une maladie :\n1. Allez sur la page **Détection** (sidebar)\n2. Uploadez une photo claire de votre plante\n3. Recevez diagnostic + traitement en quelques secondes !\n\n📸 La photo doit montrer clairement les symptômes.",
-        },
-        
-        "wo": {
-            "bonjour": "Salam aleykum ! 👋 Maa ngi AgriDetec. Noonu laa mën a ko dimbal ci sa géej. Laaj ma!",
-            "tomate": "**Tomat yi:**\n• Ndaw ci biir loxo (bul ndaw ay ndox)\n• Wàññi 50cm\n• Jëfal paaket\n• Xool mildiou ci navet",
-            "maladie": "Yépp maladii yu bari nekk ci Senegaal: mildiou, taches bactériennes. Upload nataal ngir gis ci ñu def.",
-            "default": "Laaj ma ci mbir, ci ñàkk maladii, waala bonnes pratiques ! Maa ngi fii ngir dimbalil yow. 🌱"
-        },
-        
-        "pu": {
-            "bonjour": "Jam waali ! 👋 Mi ko AgriDetec, ballal gese. Hol no tawii ma wallude ma?",
-            "tomate": "**Tomat ɗii:**\n• Ndaaw e dow leydi (hoto ndaawe e ndokke)\n• Haɗ 50cm\n• Ƴeew mildiou e hitaande ndiyam",
-            "maladie": "Maladii jamɗi e Senegaal: mildiou, taches. Upload natal ngam yiytaade.",
-            "default": "Naamno ma e laawol gese, maladii, waala njuɓɓudi moƴƴudi ! Mi ɗoo wallude ma. 🌱"
-        }
-    }
-    
     # Sélection de la langue
-    kb = knowledge_base.get(language, knowledge_base["fr"])
+    find_keyword, kb = get_kb_matcher(language)
     
-    # Recherche de correspondance
-    for keyword, response in kb.items():
-        if keyword in message_lower:
-            return response
+    # Recherche de correspondance (un seul passage sur le message)
+    keyword = find_keyword(message_lower)
+    if keyword is not None:
+        return kb[keyword]
     
     # Réponse par défaut si aucune correspondance
-    default_responses = {
-        "fr": "C'est une excellente question ! Pour une réponse précise, pouvez-vous me donner plus de détails ? Ou essayez :\n• 'Comment traiter le mildiou ?'\n• 'Conseils pour les tomates'\n• 'Quand planter au Sénégal ?'\n• 'Comment arroser mes plants ?'",
-        "wo": kb.get("default", "Laaj ma ci ay xam-xam yu gën bari ! 🌱"),
-        "pu": kb.get("default", "Naamno ma e laawol gese ! 🌱")
-    }
+    return DEFAULT_RESPONSES.get(language, DEFAULT_RESPONSES["fr"])
+
+@st.cache_resource
+def diseases_bar_fig():
+    """Graphique des maladies détectées (construit une seule fois)"""
+    import plotly.express as px  # importé à la première visite du dashboard
+    
+    fig = px.bar(
+        {"Maladie": DASHBOARD_DISEASES, "Nombre": DASHBOARD_DISEASE_COUNTS},
+        x="Maladie",
+        y="Nombre",
+        color="Nombre",
+        color_continuous_scale="Greens"
+    )
+    fig.update_layout(showlegend=False, height=350)
+    return fig
+
+@st.cache_resource
+def crops_pie_fig():
+    """Graphique de répartition par culture (construit une seule fois)"""
+    import plotly.express as px
+    
+    fig = px.pie(
+        {"Culture": DASHBOARD_CROPS, "Détections": DASHBOARD_CROP_COUNTS},
+        values="Détections",
+        names="Culture",
+        color_discrete_sequence=px.colors.sequential.Greens
+    )
+    fig.update_layout(height=350)
+    return fig
+
+@st.cache_resource
+def recent_detections_df():
+    """Tableau des détections récentes (pandas importé à la première visite du dashboard)"""
+    import pandas as pd
     
-    return default_responses.get(language, default_responses["fr"])
+    return pd.DataFrame(RECENT_DETECTIONS)
 
 def page_dashboard(language, t):
     """Page du dashboard avec statistiques"""
@@ -516,7 +942,7 @@ def page_dashboard(language, t):
     with col2:
         st.metric("Précision", "95.8%")
     with col3:
-        st.metric("Maladies", len(DATASET_DISEASES))
+        st.metric("Maladies", len(DISEASE_IDS))
     with col4:
         st.metric("Utilisateurs", "342")
     
@@ -527,51 +953,16 @@ def page_dashboard(language, t):
     
     with col1:
         st.subheader("Maladies détectées")
-        
-        diseases_data = {
-            "Maladie": ["Mildiou", "Tache bactérienne", "Septoriose", "Brûlure précoce", "Acariens"],
-            "Nombre": [320, 230, 121, 124, 89]
-        }
-        
-        fig = px.bar(
-            diseases_data,
-            x="Maladie",
-            y="Nombre",
-            color="Nombre",
-            color_continuous_scale="Greens"
-        )
-        fig.update_layout(showlegend=False, height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(diseases_bar_fig(), use_container_width=True)
     
     with col2:
         st.subheader("Répartition par culture")
-        
-        crops_data = {
-            "Culture": ["Tomate", "Pomme de terre", "Poivron"],
-            "Détections": [856, 452, 235]
-        }
-        
-        fig = px.pie(
-            crops_data,
-            values="Détections",
-            names="Culture",
-            color_discrete_sequence=px.colors.sequential.Greens
-        )
-        fig.update_layout(height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(crops_pie_fig(), use_container_width=True)
     
     # Tableau simplifié
     st.markdown("---")
     st.subheader("Détections récentes")
-    
-    recent_detections = [
-        {"Date": "16/11/2025", "Culture": "Tomate", "Maladie": "Mildiou", "Confiance": "94%"},
-        {"Date": "16/11/2025", "Culture": "Pomme de terre", "Maladie": "Brûlure précoce", "Confiance": "90%"},
-        {"Date": "15/11/2025", "Culture": "Poivron", "Maladie": "Tache bactérienne", "Confiance": "92%"},
-        {"Date": "15/11/2025", "Culture": "Tomate", "Maladie": "Sain", "Confiance": "98%"},
-    ]
-    
-    st.dataframe(recent_detections, use_container_width=True, hide_index=True)
+    st.dataframe(recent_detections_df(), use_container_width=True, hide_index=True)
 
 def page_about(language):
     """Page À propos"""
@@ -617,18 +1008,22 @@ def page_about(language):
 def main():
     """Point d'entrée principal de l'application"""
     
-    # Chargement du modèle
-    model, model_error = load_model()
+    # Chargement du modèle (et de TensorFlow) en arrière-plan : les pages
+    # s'affichent sans l'attendre
+    model_future = preload_model()
     
     # Sidebar
     language, page = render_sidebar()
     
     # Traductions
-    t = TRANSLATIONS[language]
+    t = TRANSLATIONS.get(language, TRANSLATIONS["fr"])
     
     # Routage des pages
     if page == "detection":
-        page_detection(language, t, model, model_error)
+        # Seule la page de détection attend la fin du chargement
+        with st.spinner("Chargement du modèle..."):
+            _, model_error = model_future.result()
+        page_detection(language, t, model_error)
     elif page == "chat":
         page_chatbot(language, t)
     elif page == "dashboard":
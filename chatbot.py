@@ -1,16 +1,46 @@
 # chatbot.py
 from __future__ import annotations
 
+from collections import Counter
+import functools
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Tuple
 import logging
+import math
+import re
+import time
+import unicodedata
+
+try:
+    import ahocorasick  # pyahocorasick : toutes les intentions en un seul passage
+except ImportError:
+    ahocorasick = None
+
+try:
+    from rapidfuzz import fuzz, process  # rapidfuzz : tolérance aux fautes de frappe
+except ImportError:
+    process = None
 
 log = logging.getLogger("agridetect.chatbot")
 
+# Horodatage ISO (à la seconde) recalculé au plus une fois par seconde
+_TS_CACHE = [0.0, ""]
+
+
+def _now_iso() -> str:
+    """Horodatage ISO courant, mis en cache pendant une seconde"""
+    now = time.monotonic()
+    if now - _TS_CACHE[0] >= 1.0 or not _TS_CACHE[1]:
+        _TS_CACHE[1] = datetime.now().isoformat(timespec="seconds")
+        _TS_CACHE[0] = now
+    return _TS_CACHE[1]
+
+
 # ---------------------------------------------------------------------
 # Base de connaissances : mêmes cultures / maladies que ton modèle
 # ---------------------------------------------------------------------
-DISEASE_INFO: Dict[str, Dict[str, Any]] = {
+DISEASE_INFO: Mapping[str, Dict[str, Any]] = {
     # ---------------- POIVRON / PIMENT ----------------
     "pepper_bacterial_spot": {
         "name": "Tache bactérienne du poivron",
@@ -215,202 +245,423 @@ DISEASE_INFO: Dict[str, Dict[str, Any]] = {
         "prevention": ["Surveillance régulière", "Bonne irrigation"]
     },
 }
+# Lecture seule : les index ci-dessous sont dérivés de cette base à l'import
+DISEASE_INFO = MappingProxyType(DISEASE_INFO)
+
+
+# ---------------------------------------------------------------------
+# Index de recherche : construits une seule fois à l'import
+# ---------------------------------------------------------------------
+# Nombre minimal de mots d'une fiche (nom ou culture) présents dans le message pour la retenir
+MIN_MATCHED_WORDS = 2
+# En dessous (message normalisé), aucun mot-clé ni nom de maladie ne peut figurer
+MIN_MESSAGE_LENGTH = 3
+# Similarité minimale (0-100) pour corriger un mot inconnu vers un mot de l'index
+FUZZY_MIN_SCORE = 85
+
+# Suggestions jointes à chaque réponse (et donc les questions les plus posées)
+SUGGESTED_QUERIES = (
+    "traitement mildiou tomate",
+    "prévention tache bactérienne poivron",
+    "bonnes pratiques d'arrosage",
+)
+
+
+# Messages et tables de mots comparés en minuscules et sans accents
+def _build_accent_table() -> Dict[int, str]:
+    """Lettres latines accentuées -> lettres de base (décomposition Unicode), plus œ et æ"""
+    table = {ord(lig): base for lig, base in (("œ", "oe"), ("Œ", "OE"), ("æ", "ae"), ("Æ", "AE"))}
+    for code in range(0xC0, 0x250):  # Latin-1 supplément, Latin étendu A et B
+        decomposed = unicodedata.normalize("NFKD", chr(code))
+        base = "".join(c for c in decomposed if not unicodedata.combining(c))
+        if base and base != chr(code) and base.isascii():
+            table[code] = base
+    return table
+
+
+_ACCENT_TABLE = _build_accent_table()
+
+_WORD_RE = re.compile(r"\w+")
+# Mots outils ignorés (sinon « des », « de la »... pèsent autant qu'un nom de maladie)
+_STOP_WORDS = frozenset({
+    "a", "au", "aux", "d", "de", "des", "du", "en", "et", "j", "l", "la", "le", "les", "un", "une",
+})
+
+# Mots de noms de fiches trop courants pour désigner une maladie à eux seuls
+_GENERIC_WORDS = frozenset({
+    "feuille", "feuilles", "jaune", "jaunes", "sain", "saine", "virus", "brulure", "tache",
+})
+
+# Noms français des maladies (sans accents) -> clés possibles
+_DISEASE_FR: Dict[str, List[str]] = {
+    "tache bacterienne": ["pepper_bacterial_spot", "tomato_bacterial_spot"],
+    "mildiou": ["potato_late_blight", "tomato_late_blight"],
+    "brulure precoce": ["potato_early_blight", "tomato_early_blight"],
+    "moisissure": ["tomato_leaf_mold"],
+    "septoriose": ["tomato_septoria_leaf_spot"],
+    "acariens": ["tomato_spider_mites"],
+    "tache cible": ["tomato_target_spot"],
+    "virus mosaique": ["tomato_mosaic_virus"],
+    "enroulement jaune": ["tomato_yellow_leaf_curl_virus"],
+}
+
+# Noms français des cultures (sans accents) -> préfixe des clés
+_CROP_FR: Dict[str, str] = {
+    "tomate": "tomato_",
+    "pomme de terre": "potato_",
+    "poivron": "pepper_",
+    "piment": "pepper_",
+}
+
+# Mots déclencheurs de chaque intention (sous-chaînes sans accents du message)
+_INTENT_WORDS: Dict[str, List[str]] = {
+    # Réponses générales
+    "fungal": ["fongique", "champignon"],
+    "bio": ["bio"],
+    "watering": ["arrosage", "arroser"],
+    "general_prevention": ["prevention", "eviter"],
+    "tomato": ["tomate"],
+    "disease": ["maladie"],
+    # Fiche maladie
+    "treatment": ["traitement", "soigner", "traiter"],
+    "prevention": ["prevention", "eviter"],
+    "symptoms": ["symptome", "reconnaitre"],
+}
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_text(text: str) -> str:
+    """Texte en minuscules, sans accents ni espaces autour (mis en cache)"""
+    return text.translate(_ACCENT_TABLE).lower().strip()
+
+
+def _words(text_norm: str) -> set:
+    """Mots significatifs d'un texte déjà normalisé"""
+    return {word for word in _WORD_RE.findall(text_norm) if word not in _STOP_WORDS}
+
+
+def _tokenize(text: str) -> set:
+    """Mots significatifs d'un texte, en minuscules et sans accents"""
+    return _words(_normalize_text(text))
+
+
+def _build_postings() -> Dict[str, Tuple[float, Tuple[str, ...]]]:
+    """Index inversé mot -> (poids IDF, maladies dont le nom ou la culture contient le mot)"""
+    postings: Dict[str, List[str]] = {}
+    for key, info in DISEASE_INFO.items():
+        words = _tokenize(info.get("name", "")) | _tokenize(info.get("crop", ""))
+        for word in words:
+            postings.setdefault(word, []).append(key)
+
+    # Poids IDF : un mot présent dans peu de fiches est plus discriminant
+    n_keys = len(DISEASE_INFO)
+    return {
+        word: (math.log(n_keys / len(keys)), tuple(keys))
+        for word, keys in postings.items()
+    }
+
+
+_POSTINGS = _build_postings()
+_VOCABULARY = tuple(_POSTINGS)
+_KEY_RANK = {key: i for i, key in enumerate(DISEASE_INFO)}
+# Mots du nom de chaque fiche (un nom cité en entier suffit à la retenir)
+_NAME_WORDS = {key: frozenset(_tokenize(info.get("name", ""))) for key, info in DISEASE_INFO.items()}
+# Mots qui désignent une maladie plutôt qu'une culture ou un symptôme courant
+_DISTINCTIVE_WORDS = frozenset(_POSTINGS) - _GENERIC_WORDS - {word for c_fr in _CROP_FR for word in _words(c_fr)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _closest_word(word: str) -> Optional[str]:
+    """Mot de l'index le plus proche d'un mot inconnu (faute de frappe), sinon None"""
+    if process is None or len(word) < 4:
+        return None
+    match = process.extractOne(word, _VOCABULARY, scorer=fuzz.ratio, score_cutoff=FUZZY_MIN_SCORE)
+    return match[0] if match else None
+
+
+# (culture, maladie) -> clé
+_PAIR_MAP = {
+    (c_fr, d_fr): dk
+    for c_fr, prefix in _CROP_FR.items()
+    for d_fr, d_keys in _DISEASE_FR.items()
+    for dk in d_keys
+    if dk.startswith(prefix) and dk in DISEASE_INFO
+}
+
+
+def _term_tags() -> Dict[str, Tuple[Any, ...]]:
+    """Mot-clé -> repères trouvés : intentions, ("crop", nom) et ("disease", nom)"""
+    tags: Dict[str, List[Any]] = {}
+    for intent, words in _INTENT_WORDS.items():
+        for word in words:
+            tags.setdefault(word, []).append(intent)
+    for c_fr in _CROP_FR:
+        tags.setdefault(c_fr, []).append(("crop", c_fr))
+    for d_fr in _DISEASE_FR:
+        tags.setdefault(d_fr, []).append(("disease", d_fr))
+    return {word: tuple(word_tags) for word, word_tags in tags.items()}
+
+
+def _build_term_automaton():
+    """Automate Aho-Corasick de tous les mots-clés (None sans pyahocorasick)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word, tags in _term_tags().items():
+        automaton.add_word(word, tags)
+    automaton.make_automaton()
+    return automaton
+
+
+_TERM_AUTOMATON = _build_term_automaton()
+
+
+@functools.lru_cache(maxsize=None)
+def _fallback_regexes() -> Tuple[Dict[str, re.Pattern], re.Pattern, re.Pattern]:
+    """Repli sans pyahocorasick : regex par intention, cultures et maladies (compilées au besoin)"""
+    intent_res = {
+        intent: re.compile("|".join(map(re.escape, words)))
+        for intent, words in _INTENT_WORDS.items()
+    }
+    crop_re = re.compile("|".join(map(re.escape, _CROP_FR)))
+    disease_re = re.compile("|".join(map(re.escape, _DISEASE_FR)))
+    return intent_res, crop_re, disease_re
+
+
+def _scan_terms(msg_norm: str) -> frozenset:
+    """Intentions, cultures et maladies présentes dans le message normalisé (un seul passage)"""
+    if _TERM_AUTOMATON is not None:
+        return frozenset(tag for _, tags in _TERM_AUTOMATON.iter(msg_norm) for tag in tags)
+    intent_res, crop_re, disease_re = _fallback_regexes()
+    found = {intent for intent, regex in intent_res.items() if regex.search(msg_norm)}
+    found.update(("crop", c_fr) for c_fr in crop_re.findall(msg_norm))
+    found.update(("disease", d_fr) for d_fr in disease_re.findall(msg_norm))
+    return frozenset(found)
+
+
+def _render_disease_answers(key: str) -> Dict[str, str]:
+    """Réponses d'une maladie pour chaque intention (traitement, prévention, symptômes, fiche)"""
+    data = DISEASE_INFO.get(key, {})
+    title = data.get("name", key)
+    severity = data.get("severity", "Inconnue")
+    treatments = data.get("treatments", [])
+    prevention = data.get("prevention", [])
+    symptoms = data.get("symptoms", "")
+    answers = {}
+
+    # Traitement
+    if treatments:
+        lines = [f"Traitement pour **{title}** :"]
+        for t in treatments:
+            lines.append(f"  • {t}")
+        lines.append(f"\nSévérité : **{severity}**")
+        answers["treatment"] = "\n".join(lines)
+    else:
+        answers["treatment"] = (
+            f"Pour **{title}**, pas de traitement spécifique enregistré.\n"
+            "Supprime les parties atteintes et améliore l'aération."
+        )
+
+    # Prévention
+    if prevention:
+        lines = [f"Prévention pour **{title}** :"]
+        for p in prevention:
+            lines.append(f"  • {p}")
+        answers["prevention"] = "\n".join(lines)
+    else:
+        answers["prevention"] = (
+            f"Prévention générale pour **{title}** :\n"
+            "Rotation, arrosage au pied, enlever les feuilles malades."
+        )
+
+    # Symptômes
+    if symptoms:
+        answers["symptoms"] = f"Symptômes de **{title}** 🔍 :\n{symptoms}"
+    else:
+        answers["symptoms"] = f"Symptômes de **{title}** : taches sur feuilles et affaiblissement de la plante."
+
+    # Fiche courte par défaut
+    parts = [
+        f"📋 Maladie : **{title}**",
+        f"Sévérité : {severity}",
+    ]
+    if symptoms:
+        parts.append(f"Symptômes : {symptoms}")
+    if treatments:
+        parts.append("Traitements : " + "; ".join(treatments[:2]))
+    if prevention:
+        parts.append("Prévention : " + "; ".join(prevention[:2]))
+    answers["short"] = "\n".join(parts)
+    return answers
+
+
+# Réponses de chaque maladie, rendues une seule fois
+_RENDERED_ANSWERS = {key: _render_disease_answers(key) for key in DISEASE_INFO}
+
+
+# ---------------------------------------------------------------------
+# Réponses générales (sans maladie identifiée)
+# ---------------------------------------------------------------------
+# Maladies fongiques
+_REPLY_FUNGAL = (
+    "Pour prévenir les maladies fongiques 🌿 :\n"
+    "1. Arroser au pied (pas sur les feuilles)\n"
+    "2. Espacer les plants pour que ça sèche vite\n"
+    "3. Pailler le sol pour éviter les éclaboussures\n"
+    "4. Enlever les feuilles touchées et les sortir de la parcelle\n"
+    "5. Faire une rotation des cultures\n"
+    "6. En saison humide : surveiller souvent pour traiter tôt (cuivre/soufre si autorisé)."
+)
+
+# Traitements biologiques
+_REPLY_BIO = (
+    "Traitements biologiques possibles 🌱 :\n"
+    "- Savon noir dilué (insectes, acariens)\n"
+    "- Huile de Neem (le soir, éviter fleurs ouvertes)\n"
+    "- Décoction d'ail ou de neem en prévention\n"
+    "- Cuivre/bouillie bordelaise (autorité locales)\n"
+    "- Toujours traiter le matin ou le soir."
+)
+
+# Arrosage
+_REPLY_WATERING = (
+    "Bonnes pratiques d'arrosage 💧:\n"
+    "1. Arroser au pied, pas sur les feuilles\n"
+    "2. Le matin (ou le soir s'il fait très chaud)\n"
+    "3. Garder le sol humide mais non détrempé\n"
+    "4. Pailler pour réduire l'évaporation ✅"
+)
+
+# Prévention générale
+_REPLY_PREVENTION = (
+    "Prévention générale des maladies 🛡️ :\n"
+    "- Utiliser des semences/plants sains\n"
+    "- Espacer les plants pour l'aération\n"
+    "- Arroser au pied\n"
+    "- Retirer les feuilles malades\n"
+    "- Pratiquer la rotation des cultures"
+)
+
+# Maladies courantes de la tomate
+_REPLY_TOMATO_DISEASES = (
+    "Maladies courantes de la tomate 🍅 :\n"
+    "- Mildiou\n"
+    "- Tache bactérienne\n"
+    "- Brûlure précoce\n"
+    "- Septoriose\n"
+    "- Virus de la mosaïque\n"
+    "- Virus de l'enroulement jaune\n"
+    "Demande par ex. « traitement mildiou tomate » 👍"
+)
+
+# Réponse par défaut
+_REPLY_DEFAULT = (
+    "Je n'ai pas trouvé exactement la maladie dans ton message 😅.\n"
+    "Tu peux écrire :\n"
+    "- « traitement mildiou tomate »\n"
+    "- « prévention tache bactérienne poivron »\n"
+    "- « symptômes brûlure précoce pomme de terre »\n"
+    "- « bonnes pratiques d'arrosage »"
+)
 
 
 class MultilingualAgriChatbot:
     """Chatbot agricole multilingue pour AgriDetect"""
 
+    __slots__ = ("default_lang",)
+
     def __init__(self, default_lang: str = "fr"):
         self.default_lang = default_lang
-        self._build_index()
-
-    def _build_index(self):
-        """Construit un index texte pour reconnaissance rapide"""
-        self._TEXT_INDEX = []
-        for key, info in DISEASE_INFO.items():
-            name = info.get("name", "")
-            crop = info.get("crop", "")
-            if name:
-                self._TEXT_INDEX.append((name.lower(), key))
-            if crop:
-                self._TEXT_INDEX.append((crop.lower(), key))
 
     def _normalize(self, text: str) -> str:
-        """Normalise un texte pour recherche"""
-        return text.lower().strip()
+        """Normalise un texte pour recherche (minuscules, sans accents)"""
+        return _normalize_text(text)
 
-    def _find_disease_key(self, msg_norm: str) -> Optional[str]:
+    @staticmethod
+    def _find_disease_key(msg_norm: str, terms: frozenset) -> Optional[str]:
         """Trouve la clé maladie dans le message normalisé"""
-        # 1) Essai : correspondance crop + disease
-        disease_fr = {
-            "tache bactérienne": ["pepper_bacterial_spot", "tomato_bacterial_spot"],
-            "mildiou": ["potato_late_blight", "tomato_late_blight"],
-            "brûlure précoce": ["potato_early_blight", "tomato_early_blight"],
-            "moisissure": ["tomato_leaf_mold"],
-            "septoriose": ["tomato_septoria_leaf_spot"],
-            "acariens": ["tomato_spider_mites"],
-            "tache cible": ["tomato_target_spot"],
-            "virus mosaïque": ["tomato_mosaic_virus"],
-            "enroulement jaune": ["tomato_yellow_leaf_curl_virus"],
+        # 1) Tentative 1 : culture + maladie nommées dans le message
+        for c_fr in _CROP_FR:
+            if ("crop", c_fr) in terms:
+                for d_fr in _DISEASE_FR:
+                    if ("disease", d_fr) in terms and (c_fr, d_fr) in _PAIR_MAP:
+                        return _PAIR_MAP[(c_fr, d_fr)]
+
+        # Culture(s) nommée(s) : les fiches des autres cultures sont écartées
+        prefixes = tuple(prefix for c_fr, prefix in _CROP_FR.items() if ("crop", c_fr) in terms)
+
+        def crop_ok(key: str) -> bool:
+            return not prefixes or key.startswith(prefixes)
+
+        # 2) Tentative 2 : nom de maladie seul, s'il ne désigne qu'une fiche (ex. « septoriose »)
+        named = {
+            key
+            for d_fr, d_keys in _DISEASE_FR.items()
+            if ("disease", d_fr) in terms
+            for key in d_keys
+            if crop_ok(key)
         }
-
-        crop_fr = {
-            "tomate": ["tomato_"],
-            "pomme de terre": ["potato_"],
-            "poivron": ["pepper_"],
-            "piment": ["pepper_"],
-        }
-
-        # Tentative 1 : correspondance directe crop + disease
-        for c_fr, c_keys in crop_fr.items():
-            if c_fr in msg_norm:
-                for d_fr, d_keys in disease_fr.items():
-                    if d_fr in msg_norm:
-                        for ck in c_keys:
-                            for dk in d_keys:
-                                candidate = f"{ck}{dk.replace('_', '')}"
-                                for real_key in DISEASE_INFO.keys():
-                                    if ck in real_key and dk.replace("_", "") in real_key:
-                                        return real_key
-
-        # 2) Tentative 2 : matching texte plus souple
-        for text, key in self._TEXT_INDEX:
-            parts = text.split()
-            matches = sum(1 for p in parts if p in msg_norm)
-            if matches >= min(2, len(parts)):
-                return key
-
-        # 3) Tentative 3 : matching simple
-        for text, key in self._TEXT_INDEX:
-            if text in msg_norm:
-                return key
-
-        return None
-
-    def _general_reply(self, msg_norm: str) -> str:
+        if len(named) == 1:
+            return named.pop()
+
+        # 3) Tentative 3 : mots du message (fautes corrigées) dans l'index inversé, score IDF ;
+        #    une fiche doit avoir au moins deux mots présents, dont un distinctif, ou tout son nom
+        words = {word if word in _POSTINGS else _closest_word(word) for word in _words(msg_norm)}
+        hits: Dict[str, List[str]] = {}
+        for word in words:
+            posting = _POSTINGS.get(word)
+            if posting and posting[0]:
+                for key in posting[1]:
+                    hits.setdefault(key, []).append(word)
+
+        scores: Counter = Counter()
+        for key, key_words in hits.items():
+            if len(key_words) < MIN_MATCHED_WORDS or not crop_ok(key):
+                continue
+            if _NAME_WORDS[key] <= words or _DISTINCTIVE_WORDS.intersection(key_words):
+                scores[key] = sum(_POSTINGS[word][0] for word in key_words)
+        if not scores:
+            return None
+
+        # Meilleur score ; à égalité, ordre de DISEASE_INFO
+        return max(scores, key=lambda key: (scores[key], -_KEY_RANK[key]))
+
+    @staticmethod
+    def _general_reply(intents: frozenset) -> str:
         """Génère une réponse générale si pas de maladie trouvée"""
-        # Maladie fongique
-        if any(word in msg_norm for word in ["maladie fongique", "fongique", "champignon", "champignons"]):
-            return (
-                "Pour prévenir les maladies fongiques 🌿 :\n"
-                "1. Arroser au pied (pas sur les feuilles)\n"
-                "2. Espacer les plants pour que ça sèche vite\n"
-                "3. Pailler le sol pour éviter les éclaboussures\n"
-                "4. Enlever les feuilles touchées et les sortir de la parcelle\n"
-                "5. Faire une rotation des cultures\n"
-                "6. En saison humide : surveiller souvent pour traiter tôt (cuivre/soufre si autorisé)."
-            )
-
-        # Traitement biologique
-        if any(word in msg_norm for word in ["traitement biologique", "traitements biologiques", "bio"]):
-            return (
-                "Traitements biologiques possibles 🌱 :\n"
-                "- Savon noir dilué (insectes, acariens)\n"
-                "- Huile de Neem (le soir, éviter fleurs ouvertes)\n"
-                "- Décoction d'ail ou de neem en prévention\n"
-                "- Cuivre/bouillie bordelaise (autorité locales)\n"
-                "- Toujours traiter le matin ou le soir."
-            )
-
-        # Arrosage
-        if any(word in msg_norm for word in ["arrosage", "arroser"]):
-            return (
-                "Bonnes pratiques d'arrosage 💧:\n"
-                "1. Arroser au pied, pas sur les feuilles\n"
-                "2. Le matin (ou le soir s'il fait très chaud)\n"
-                "3. Garder le sol humide mais non détrempé\n"
-                "4. Pailler pour réduire l'évaporation ✅"
-            )
-
-        # Prévention générale
-        if any(word in msg_norm for word in ["prevention", "prévention", "eviter maladie", "éviter"]):
-            return (
-                "Prévention générale des maladies 🛡️ :\n"
-                "- Utiliser des semences/plants sains\n"
-                "- Espacer les plants pour l'aération\n"
-                "- Arroser au pied\n"
-                "- Retirer les feuilles malades\n"
-                "- Pratiquer la rotation des cultures"
-            )
-
-        # Tomate + maladie
-        if "tomate" in msg_norm and "maladie" in msg_norm:
-            return (
-                "Maladies courantes de la tomate 🍅 :\n"
-                "- Mildiou\n"
-                "- Tache bactérienne\n"
-                "- Brûlure précoce\n"
-                "- Septoriose\n"
-                "- Virus de la mosaïque\n"
-                "- Virus de l'enroulement jaune\n"
-                "Demande par ex. « traitement mildiou tomate » 👍"
-            )
-
-        # Réponse par défaut
-        return (
-            "Je n'ai pas trouvé exactement la maladie dans ton message 😅.\n"
-            "Tu peux écrire :\n"
-            "- « traitement mildiou tomate »\n"
-            "- « prévention tache bactérienne poivron »\n"
-            "- « symptômes brûlure précoce pomme de terre »\n"
-            "- « bonnes pratiques d'arrosage »"
-        )
-
-    def _format_disease_answer(self, key: str, msg_norm: str) -> str:
+        if "fungal" in intents:
+            return _REPLY_FUNGAL
+        if "bio" in intents:
+            return _REPLY_BIO
+        if "watering" in intents:
+            return _REPLY_WATERING
+        if "general_prevention" in intents:
+            return _REPLY_PREVENTION
+        if "tomato" in intents and "disease" in intents:
+            return _REPLY_TOMATO_DISEASES
+        return _REPLY_DEFAULT
+
+    @staticmethod
+    def _format_disease_answer(key: str, intents: frozenset) -> str:
         """Formate la réponse pour une maladie spécifique"""
-        data = DISEASE_INFO.get(key, {})
-        title = data.get("name", key)
-        severity = data.get("severity", "Inconnue")
-        treatments = data.get("treatments", [])
-        prevention = data.get("prevention", [])
-        symptoms = data.get("symptoms", "")
-
-        # Traitement ?
-        if any(word in msg_norm for word in ["traitement", "soigner", "traiter"]):
-            if treatments:
-                lines = [f"Traitement pour **{title}** :"]
-                for t in treatments:
-                    lines.append(f"  • {t}")
-                lines.append(f"\nSévérité : **{severity}**")
-                return "\n".join(lines)
-            else:
-                return (
-                    f"Pour **{title}**, pas de traitement spécifique enregistré.\n"
-                    "Supprime les parties atteintes et améliore l'aération."
-                )
-
-        # Prévention ?
-        if any(word in msg_norm for word in ["prevention", "prévention", "eviter", "éviter"]):
-            if prevention:
-                lines = [f"Prévention pour **{title}** :"]
-                for p in prevention:
-                    lines.append(f"  • {p}")
-                return "\n".join(lines)
-            else:
-                return (
-                    f"Prévention générale pour **{title}** :\n"
-                    "Rotation, arrosage au pied, enlever les feuilles malades."
-                )
-
-        # Symptômes ?
-        if any(word in msg_norm for word in ["symptome", "symptômes", "reconnaitre", "reconnaître"]):
-            if symptoms:
-                return f"Symptômes de **{title}** 🔍 :\n{symptoms}"
-            else:
-                return f"Symptômes de **{title}** : taches sur feuilles et affaiblissement de la plante."
-
-        # Fiche courte par défaut
-        parts = [
-            f"📋 Maladie : **{title}**",
-            f"Sévérité : {severity}",
-        ]
-        if symptoms:
-            parts.append(f"Symptômes : {symptoms}")
-        if treatments:
-            parts.append("Traitements : " + "; ".join(treatments[:2]))
-        if prevention:
-            parts.append("Prévention : " + "; ".join(prevention[:2]))
-        return "\n".join(parts)
+        answers = _RENDERED_ANSWERS[key]
+        # Traitement ? Prévention ? Symptômes ? Sinon fiche courte
+        for intent in ("treatment", "prevention", "symptoms"):
+            if intent in intents:
+                return answers[intent]
+        return answers["short"]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _compute(msg_norm: str) -> Tuple[str, str]:
+        """Texte et intention de la réponse (mis en cache : les messages se répètent beaucoup)"""
+        if len(msg_norm) < MIN_MESSAGE_LENGTH:
+            return _REPLY_DEFAULT, "general"
+        terms = _scan_terms(msg_norm)
+        disease_key = MultilingualAgriChatbot._find_disease_key(msg_norm, terms)
+        if disease_key:
+            return MultilingualAgriChatbot._format_disease_answer(disease_key, terms), "disease_info"
+        return MultilingualAgriChatbot._general_reply(terms), "general"
 
     def reply(
         self,
@@ -435,40 +686,73 @@ class MultilingualAgriChatbot:
         extra_context: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Génère une réponse complète au chatbot"""
-        msg_norm = self._normalize(message)
-        disease_key = self._find_disease_key(msg_norm)
+        text, intent = self._compute(self._normalize(message))
+        return self._build_response(
+            text, intent, language or self.default_lang, session_id, extra_context, _now_iso()
+        )
 
-        if disease_key:
-            text = self._format_disease_answer(disease_key, msg_norm)
-            intent = "disease_info"
-        else:
-            text = self._general_reply(msg_norm)
-            intent = "general"
+    def generate_text(self, message: str) -> str:
+        """Texte seul de la réponse (sans horodatage, suggestions ni contexte)"""
+        return self._compute(self._normalize(message))[0]
+
+    def reply_batch(
+        self,
+        messages: List[str],
+        session_id: str = "default",
+        language: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Répond à une liste de messages en une passe (évaluation, préchauffage)"""
+        compute, normalize, build = self._compute, self._normalize, self._build_response
+        language = language or self.default_lang
+        timestamp = _now_iso()
+        return [
+            build(*compute(normalize(message)), language, session_id, context, timestamp)
+            for message in messages
+        ]
 
+    @staticmethod
+    def _build_response(
+        text: str,
+        intent: str,
+        language: str,
+        session_id: str,
+        extra_context: Optional[Dict[str, Any]],
+        timestamp: str,
+    ) -> Dict[str, Any]:
+        """Assemble le dictionnaire de réponse attendu par main.py"""
         return {
             "response": text,
-            "language": language or self.default_lang,
+            "language": language,
             "intent": intent,
-            "suggestions": [
-                "traitement mildiou tomate",
-                "prévention tache bactérienne poivron",
-                "bonnes pratiques d'arrosage",
-            ],
+            "suggestions": SUGGESTED_QUERIES,
             "context": {
                 "session_id": session_id,
                 "topic": "plant_disease_assistant",
                 **(extra_context or {}),
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
         }
 
 
+@functools.lru_cache(maxsize=None)
+def _default_bot(language: str) -> MultilingualAgriChatbot:
+    """Instance partagée du chatbot pour une langue (créée au premier appel)"""
+    return MultilingualAgriChatbot(default_lang=language)
+
+
+# Réponses aux suggestions calculées dès l'import : déjà en cache au premier clic
+_default_bot("fr").reply_batch(list(SUGGESTED_QUERIES))
+
+
 class ChatbotManager:
     """🟢 Classe requise par main.py pour gérer le chatbot"""
 
+    __slots__ = ("_bot", "_available")
+
     def __init__(self):
         try:
-            self._bot = MultilingualAgriChatbot(default_lang="fr")
+            self._bot = _default_bot("fr")
             self._available = True
             log.info("✅ ChatbotManager initialisé avec succès")
         except Exception as e:
@@ -480,6 +764,11 @@ class ChatbotManager:
         """Vérifie si le chatbot est disponible"""
         return self._available and self._bot is not None
 
+    def cache_clear(self) -> None:
+        """Vide le cache des réponses (après modification de la base de connaissances)"""
+        MultilingualAgriChatbot._compute.cache_clear()
+        _normalize_text.cache_clear()
+
     def reply(
         self,
         message: str,
@@ -496,7 +785,7 @@ class ChatbotManager:
                 "intent": "error",
                 "suggestions": [],
                 "context": {"session_id": session_id},
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "success": False,
             }
 
@@ -507,6 +796,18 @@ class ChatbotManager:
             context=context,
         )
 
+    def reply_batch(
+        self,
+        messages: List[str],
+        session_id: str = "default",
+        language: str = "fr",
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Génère les réponses d'une liste de messages"""
+        if not self.is_available():
+            return [self.reply(message, session_id, language, context) for message in messages]
+        return self._bot.reply_batch(messages, session_id=session_id, language=language, context=context)
+
 
 # =====================================================================
 # 🟢 Fonction EXACTEMENT compatible avec ton main.py
@@ -523,7 +824,7 @@ def generate_chat_response(
         generate_chat_response(self._bot, message=..., session_id=..., language=..., extra_context=...)
     """
     if bot is None:
-        bot = MultilingualAgriChatbot(default_lang=language)
+        bot = _default_bot(language)
     return bot.generate_response(
         message=message,
         session_id=session_id,
@@ -532,6 +833,19 @@ def generate_chat_response(
     )
 
 
+def generate_chat_responses(
+    bot: Optional[MultilingualAgriChatbot],
+    messages: List[str],
+    session_id: str = "default",
+    language: str = "fr",
+    extra_context: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Version par lot de generate_chat_response"""
+    if bot is None:
+        bot = _default_bot(language)
+    return bot.reply_batch(messages, session_id=session_id, language=language, context=extra_context)
+
+
 if __name__ == "__main__":
     # Test du chatbot
     print("🤖 Tests du ChatbotManager\n")
@@ -546,9 +860,8 @@ if __name__ == "__main__":
         "Tomate saine ?",
     ]
 
-    for test_msg in tests:
+    for test_msg, response in zip(tests, manager.reply_batch(tests, language="fr")):
         print(f"❓ Entrée: {test_msg}")
-        response = manager.reply(test_msg, language="fr")
         print(f"✅ Réponse: {response['response']}")
         print(f"   Intent: {response['intent']}")
         print()
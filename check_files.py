@@ -10,9 +10,11 @@ def check_model_files():
     print(f"✅ Existe: {model_dir.exists()}")
     
     if model_dir.exists():
-        for item in model_dir.iterdir():
-            size = item.stat().st_size if item.is_file() else "dossier"
-            print(f"   - {item.name} ({size})")
+        # DirEntry : type et taille sans appel stat() supplémentaire
+        with os.scandir(model_dir) as entries:
+            for item in entries:
+                size = item.stat().st_size if item.is_file() else "dossier"
+                print(f"   - {item.name} ({size})")
         
         # Vérifier spécifiquement model.keras
         model_file = model_dir / "model.keras"
@@ -27,8 +29,8 @@ def check_model_files():
             print(f"✅ metadata.json trouvé")
             try:
                 import json
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+                # Octets bruts : json détecte l'UTF-8 (avec ou sans BOM) lui-même
+                metadata = json.loads(metadata_file.read_bytes())
                 print(f"📊 Contenu metadata: {metadata.keys()}")
                 if 'classes' in metadata:
                     print(f"🔤 Classes dans metadata: {len(metadata['classes'])}")
@@ -1,6 +1,6 @@
 # check_model.py
+import fnmatch
 import os
-from pathlib import Path
 from disease_detector import PlantDiseaseDetector
 
 def diagnose_model_loading():
@@ -15,15 +15,18 @@ def diagnose_model_loading():
     
     # Lister le contenu
     print("\n📁 Contenu du dossier:")
-    for item in Path(model_path).iterdir():
-        print(f"   - {item.name} ({'fichier' if item.is_file() else 'dossier'})")
+    with os.scandir(model_path) as entries:
+        names = []
+        for item in entries:
+            print(f"   - {item.name} ({'fichier' if item.is_file() else 'dossier'})")
+            names.append(item.name)
     
-    # Vérifier les fichiers requis
-    model_files = list(Path(model_path).glob("model.*"))
-    metadata_files = list(Path(model_path).glob("metadata.json"))
+    # Vérifier les fichiers requis (dans le listing ci-dessus, sans nouveau parcours)
+    model_files = fnmatch.filter(names, "model.*")
+    metadata_files = fnmatch.filter(names, "metadata.json")
     
-    print(f"\n🔍 Fichiers model.* trouvés: {[f.name for f in model_files]}")
-    print(f"🔍 Fichiers metadata.json trouvés: {[f.name for f in metadata_files]}")
+    print(f"\n🔍 Fichiers model.* trouvés: {model_files}")
+    print(f"🔍 Fichiers metadata.json trouvés: {metadata_files}")
     
     if not model_files:
         print("❌ Aucun fichier model.* trouvé!")
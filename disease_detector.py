@@ -12,7 +12,9 @@ PlantDiseaseDetector — version robuste et alignée avec ton entraînement
 
 import os
 import json
+import functools
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -20,12 +22,25 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
 from PIL import Image, ImageFile
 
+# Noyaux oneDNN et pools de threads, fixés avant l'import de TensorFlow
+# (valeurs par défaut : l'environnement peut les surcharger)
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(os.cpu_count() or 1))
+os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+# taille d'entrée fixe : quelques primitives oneDNN suffisent, le cache ne grossit pas
+os.environ.setdefault("ONEDNN_PRIMITIVE_CACHE_CAPACITY", "16")
+
 import tensorflow as tf  # type: ignore
 from tensorflow import keras  # type: ignore
 from tensorflow.keras import layers  # type: ignore
 from tensorflow.keras.applications import EfficientNetB0  # type: ignore
 from tensorflow.keras.applications.efficientnet import preprocess_input as effnet_preprocess  # type: ignore
 
+try:
+    import onnxruntime as ort  # type: ignore
+except ImportError:
+    ort = None
+
 # ---------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------
@@ -48,6 +63,34 @@ try:
 except Exception as e:
     logger.warning(f"⚠️  Configuration GPU échouée: {e}")
 
+# Compilation XLA de la passe d'inférence Keras (désactivable : AGRIDETECT_XLA=0)
+XLA_INFERENCE = os.getenv("AGRIDETECT_XLA", "1") == "1"
+
+# Précision mixte (GPU avec Tensor Cores) : AGRIDETECT_MIXED_PRECISION=1
+if os.getenv("AGRIDETECT_MIXED_PRECISION", "0") == "1":
+    keras.mixed_precision.set_global_policy("mixed_float16")
+    logger.info("✅ Politique mixed_float16 activée")
+
+# ---------------------------------------------------------------------
+# Modèles optimisés optionnels, par priorité :
+# ONNX (export_onnx.py) via onnxruntime, puis TFLite INT8 pour le CPU
+# et FP16 pour GPU / mobile (export_tflite.py)
+# ---------------------------------------------------------------------
+ONNX_MODEL_FILE = "model.onnx"
+# INT8 calibré sur les pixels [0, 255] (export_tflite.py --raw-pixels) ;
+# model_int8.tflite, calibré sur [0, 1], est réservé à app.py
+TFLITE_MODEL_FILE = "model_int8_raw.tflite"
+TFLITE_FP16_MODEL_FILE = "model_fp16.tflite"
+
+# Images de contrôle (uint8) écrites par export_tflite.py à côté du modèle
+TFLITE_CHECK_FILE = "tflite_check_samples.npy"
+# Part minimale d'images où TFLite et Keras donnent la même classe pour garder un modèle TFLite
+TFLITE_MIN_AGREEMENT = 0.9
+# Sans images de contrôle : images de bruit [0, 255], vérification moins fiable
+TFLITE_NOISE_PROBES = 8
+# Fournisseurs onnxruntime préférés : TensorRT (FP16), puis CUDA, puis CPU
+ONNX_PROVIDERS = ("TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider")
+
 # ---------------------------------------------------------------------
 # 1. Mapping des labels du dataset -> clés normalisées
 # (c’est exactement ce qu’il y a dans ton metadata.json)
@@ -75,6 +118,10 @@ CLASS_ALIASES: Dict[str, str] = {
     "Tomato_healthy": "tomato_healthy",
 }
 
+# Constantes dérivées, calculées une fois à l'import
+NUM_CLASSES = len(set(CLASS_ALIASES.values()))
+DEFAULT_CLASS_NAMES = tuple(CLASS_ALIASES)
+
 # ---------------------------------------------------------------------
 # 2. Infos maladies (fr / wo / pu) — comme dans ton backend
 # ---------------------------------------------------------------------
@@ -300,11 +347,50 @@ TREATMENTS_DB: Dict[str, Dict[str, Dict[str, Any]]] = {
 }
 
 
+# ---------------------------------------------------------------------
+# 4. Prétraitement des images
+# ---------------------------------------------------------------------
+# Nombre d'images fichiers prétraitées gardées en mémoire (~600 Ko chacune en 224x224)
+PREPROCESS_CACHE_SIZE = int(os.getenv("AGRIDETECT_PREPROCESS_CACHE", "32"))
+
+
+def _fill_input(img: Image.Image, size: Tuple[int, int], out: np.ndarray) -> None:
+    """Redimensionne img et l'écrit dans out (H, W, 3) float32."""
+    height, width = size
+    if img.mode != "RGB":  # convert("RGB") copierait l'image même déjà en RGB
+        img = img.convert("RGB")
+    # grandes images : réduction par blocs entiers avant le rééchantillonnage
+    img = img.resize((width, height), reducing_gap=2.0)
+    out[...] = np.asarray(img)  # conversion uint8 -> float32 directement dans le tampon
+    # TRÈS IMPORTANT: prétraitement EfficientNet, pas MobileNet
+    arr = effnet_preprocess(out)
+    if arr is not out:
+        out[...] = arr
+
+
+@functools.lru_cache(maxsize=PREPROCESS_CACHE_SIZE)
+def _preprocess_file(path: str, mtime_ns: int, size: Tuple[int, int]) -> np.ndarray:
+    """Image fichier prétraitée (H, W, 3), en lecture seule ; mtime_ns invalide l'entrée si le fichier change."""
+    height, width = size
+    with Image.open(path) as img:
+        # JPEG : décodage directement à échelle réduite (>= taille cible)
+        img.draft("RGB", (width, height))
+        arr = np.empty((height, width, 3), dtype=np.float32)
+        _fill_input(img, size, arr)
+    arr.flags.writeable = False
+    return arr
+
+
 class PlantDiseaseDetector:
     """Détecteur de maladies basé sur un modèle Keras entraîné (EfficientNetB0)."""
 
     def __init__(self, model_path: Optional[str] = None):
         self.model: Optional[keras.Model] = None
+        self.interpreter: Optional[tf.lite.Interpreter] = None
+        self._tflite_lock = threading.Lock()  # un seul appel à la fois sur l'interpréteur partagé
+        self.onnx_session = None
+        self._infer = None  # passe d'inférence Keras tracée (tf.function)
+        self._buffers = threading.local()  # tampons d'entrée réutilisés, un par thread
         self.class_names: List[str] = []
         self.image_size: Tuple[int, int] = (224, 224)
         self.is_loaded: bool = False
@@ -323,9 +409,9 @@ class PlantDiseaseDetector:
     # -----------------------------------------------------------------
     def _build_fallback_model(self) -> None:
         try:
-            num_classes = len(set(CLASS_ALIASES.values()))
-            self._build_efficientnet_model(num_classes)
-            self.class_names = list(CLASS_ALIASES.keys())
+            self._build_efficientnet_model(NUM_CLASSES)
+            self.class_names = list(DEFAULT_CLASS_NAMES)
+            self._index_classes()
             self.is_loaded = True
             logger.info("✅ Modèle de fallback construit avec EfficientNetB0")
         except Exception as e:
@@ -345,7 +431,8 @@ class PlantDiseaseDetector:
         x = base(x, training=False)
         x = layers.GlobalAveragePooling2D()(x)
         x = layers.Dropout(0.3)(x)
-        outputs = layers.Dense(num_classes, activation="softmax")(x)
+        # softmax en float32 même sous mixed_float16 (stabilité numérique)
+        outputs = layers.Dense(num_classes, activation="softmax", dtype="float32")(x)
 
         self.model = keras.Model(inputs, outputs)
         self.model.compile(
@@ -353,6 +440,7 @@ class PlantDiseaseDetector:
             loss="categorical_crossentropy",
             metrics=["accuracy"],
         )
+        self._infer = self._make_infer()
         return self.model
 
     # -----------------------------------------------------------------
@@ -360,6 +448,8 @@ class PlantDiseaseDetector:
     # -----------------------------------------------------------------
     def _try_load_model(self, path: str) -> None:
         logger.info(f"🔍 Chargement du modèle depuis: {path}")
+        self.interpreter = None
+        self.onnx_session = None
 
         if not os.path.exists(path):
             logger.error(f"❌ Chemin inexistant: {path}")
@@ -397,11 +487,49 @@ class PlantDiseaseDetector:
 
         # si on est ici: modèle chargé → on lit le metadata
         self._load_metadata(path)
+        self._index_classes()
+        self._infer = self._make_infer()
+
+        # version ONNX si elle a été exportée à côté et qu'onnxruntime est installé
+        onnx_path = os.path.join(path, ONNX_MODEL_FILE)
+        if ort is not None and os.path.exists(onnx_path):
+            try:
+                self.onnx_session = self._create_onnx_session(onnx_path)
+                logger.info(f"✅ Modèle ONNX chargé ({self.onnx_session.get_providers()[0]})")
+            except Exception as e:
+                logger.error(f"❌ Échec du chargement ONNX: {e}")
+                self.onnx_session = None
+
+        # sinon version TFLite (INT8 puis FP16) si elle a été exportée à côté,
+        # gardée seulement si elle donne les mêmes classes que Keras
+        check_images = None
+        for tflite_file in (TFLITE_MODEL_FILE, TFLITE_FP16_MODEL_FILE):
+            tflite_path = os.path.join(path, tflite_file)
+            if self.onnx_session is not None or not os.path.exists(tflite_path):
+                continue
+            try:
+                self.interpreter = tf.lite.Interpreter(model_path=tflite_path, num_threads=os.cpu_count())
+                self.interpreter.allocate_tensors()
+                if check_images is None:
+                    check_images = self._tflite_check_images(path)
+                agreement = self._tflite_agreement(check_images)
+                if agreement < TFLITE_MIN_AGREEMENT:
+                    logger.warning(
+                        f"⚠️ {tflite_file} ignoré : même classe que Keras sur {agreement:.0%} "
+                        "des images de contrôle (plage d'entrée différente ?)"
+                    )
+                    self.interpreter = None
+                    continue
+                logger.info(f"✅ Modèle TFLite chargé: {tflite_file}")
+                break
+            except Exception as e:
+                logger.error(f"❌ Échec du chargement {tflite_file}: {e}")
+                self.interpreter = None
 
         # petit test
         try:
             dummy = np.random.random((1, self.image_size[0], self.image_size[1], 3)).astype(np.float32)
-            _ = self.model.predict(dummy, verbose=0)
+            _ = self._run_model(dummy)
             self.is_loaded = True
             logger.info(f"✅ Modèle opérationnel ({len(self.class_names)} classes)")
         except Exception as e:
@@ -415,7 +543,7 @@ class PlantDiseaseDetector:
         meta_path = os.path.join(path, "metadata.json")
         if not os.path.exists(meta_path):
             logger.warning("⚠️ metadata.json non trouvé → on utilise les classes par défaut")
-            self.class_names = list(CLASS_ALIASES.keys())
+            self.class_names = list(DEFAULT_CLASS_NAMES)
             return
 
         try:
@@ -428,7 +556,7 @@ class PlantDiseaseDetector:
             elif "class_names" in meta and isinstance(meta["class_names"], list):
                 self.class_names = meta["class_names"]
             else:
-                self.class_names = list(CLASS_ALIASES.keys())
+                self.class_names = list(DEFAULT_CLASS_NAMES)
 
             logger.info(f"📊 {len(self.class_names)} classes chargées depuis metadata.json")
 
@@ -442,24 +570,32 @@ class PlantDiseaseDetector:
 
         except Exception as e:
             logger.error(f"⚠️ Erreur lecture metadata.json: {e}")
-            self.class_names = list(CLASS_ALIASES.keys())
+            self.class_names = list(DEFAULT_CLASS_NAMES)
 
     # -----------------------------------------------------------------
     # Prétraitement image (⚠️ EfficientNet)
     # -----------------------------------------------------------------
     def preprocess_image(self, image: Union[str, Path, Image.Image]) -> np.ndarray:
+        arr = np.empty((1, *self.image_size, 3), dtype=np.float32)
+        self._preprocess_into(image, arr[0])
+        return arr
+
+    def _input_buffer(self) -> np.ndarray:
+        """Tampon d'entrée (1, H, W, 3) réutilisé d'une prédiction à l'autre (un par thread)."""
+        buf = getattr(self._buffers, "input", None)
+        if buf is None or buf.shape[1:3] != self.image_size:
+            buf = self._buffers.input = np.empty((1, *self.image_size, 3), dtype=np.float32)
+        return buf
+
+    def _preprocess_into(self, image: Union[str, Path, Image.Image], out: np.ndarray) -> None:
+        """Écrit l'image prétraitée dans out (H, W, 3), sans tableau intermédiaire."""
         try:
             if isinstance(image, (str, Path)):
-                img = Image.open(image)
+                # fichier : résultat mis en cache (nouvelle tentative, autre langue...)
+                path = os.fspath(image)
+                out[...] = _preprocess_file(path, os.stat(path).st_mtime_ns, self.image_size)
             else:
-                img = image
-
-            img = img.convert("RGB").resize(self.image_size)
-            arr = np.array(img, dtype=np.float32)
-            # TRÈS IMPORTANT: prétraitement EfficientNet, pas MobileNet
-            arr = effnet_preprocess(arr)
-            arr = np.expand_dims(arr, 0)
-            return arr
+                _fill_input(image, self.image_size, out)
         except Exception as e:
             logger.error(f"❌ Erreur prétraitement image: {e}")
             raise ValueError(f"Impossible de prétraiter l'image: {e}")
@@ -467,14 +603,21 @@ class PlantDiseaseDetector:
     # -----------------------------------------------------------------
     # Helpers de mapping
     # -----------------------------------------------------------------
-    def _dir_to_key(self, dir_label: str) -> str:
-        return CLASS_ALIASES.get(dir_label, dir_label)
-
-    def _get_safe_class_name(self, idx: int) -> Tuple[str, str]:
-        if not self.class_names or idx >= len(self.class_names):
-            return "unknown", "unknown"
-        raw_label = self.class_names[idx]
-        return raw_label, self._dir_to_key(raw_label)
+    def _index_classes(self) -> None:
+        """Tables par indice de classe (label, clé, gravité, nom par langue), calculées une fois.
+        Une dernière case "unknown" sert aux indices hors de class_names."""
+        labels = tuple(self.class_names) + ("unknown",)
+        keys = tuple(CLASS_ALIASES.get(label, label) for label in self.class_names) + ("unknown",)
+        self._class_labels = labels
+        self._class_keys = keys
+        self._class_severity = tuple(DISEASE_INFO.get(k, {}).get("severity", "Inconnue") for k in keys)
+        self._class_display = {
+            lang: tuple(
+                self._name_localized(k, lang) if k != "unknown" else label.replace("_", " ")
+                for label, k in zip(labels, keys)
+            )
+            for lang in ("fr", "wo", "pu")
+        }
 
     def _name_localized(self, key: str, lang: str) -> str:
         if key == "unknown":
@@ -493,90 +636,222 @@ class PlantDiseaseDetector:
                 outs.append(data)
         return outs
 
+    # -----------------------------------------------------------------
+    # Inférence (ONNX, TFLite ou Keras)
+    # -----------------------------------------------------------------
+    @staticmethod
+    def _create_onnx_session(onnx_path: str):
+        available = ort.get_available_providers()
+        providers: List[Any] = []
+        for provider in ONNX_PROVIDERS:
+            if provider not in available:
+                continue
+            if provider == "TensorrtExecutionProvider":
+                # moteur TensorRT en FP16, mis en cache à côté du modèle (pas de reconstruction au démarrage)
+                provider = (provider, {
+                    "trt_fp16_enable": True,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": os.path.dirname(onnx_path),
+                })
+            providers.append(provider)
+        return ort.InferenceSession(onnx_path, providers=providers)
+
+    def _predict_tflite(self, x: np.ndarray) -> np.ndarray:
+        # détails lus sous le verrou : un autre thread a pu redimensionner l'interpréteur
+        with self._tflite_lock:
+            input_details = self.interpreter.get_input_details()[0]
+
+            if input_details["dtype"] != np.float32:
+                # quantification de l'entrée avec les paramètres du modèle
+                scale, zero_point = input_details["quantization"]
+                info = np.iinfo(input_details["dtype"])
+                x = np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(input_details["dtype"])
+
+            # adapter la taille du lot (le modèle exporté attend un lot de 1)
+            if tuple(input_details["shape"]) != x.shape:
+                self.interpreter.resize_tensor_input(input_details["index"], x.shape)
+                self.interpreter.allocate_tensors()
+
+            self.interpreter.set_tensor(input_details["index"], x)
+            self.interpreter.invoke()
+            output_details = self.interpreter.get_output_details()[0]
+            preds = self.interpreter.get_tensor(output_details["index"])
+
+        if output_details["dtype"] != np.float32:
+            scale, zero_point = output_details["quantization"]
+            preds = (preds.astype(np.float32) - zero_point) * scale
+        return preds
+
+    def _tflite_check_images(self, path: str) -> np.ndarray:
+        """Images de contrôle en pixels [0, 255] : échantillons de calibration, sinon bruit."""
+        check_path = os.path.join(path, TFLITE_CHECK_FILE)
+        if os.path.exists(check_path):
+            try:
+                samples = np.load(check_path)
+                if samples.ndim == 4 and samples.shape[1:] == (*self.image_size, 3):
+                    return samples.astype(np.float32)
+                logger.warning(f"⚠️ {TFLITE_CHECK_FILE} ignoré : forme {samples.shape} inattendue")
+            except Exception as e:
+                logger.warning(f"⚠️ Lecture de {TFLITE_CHECK_FILE} impossible: {e}")
+        logger.warning(f"⚠️ {TFLITE_CHECK_FILE} absent → contrôle TFLite sur images de bruit (moins fiable)")
+        rng = np.random.default_rng(0)
+        return rng.uniform(0.0, 255.0, (TFLITE_NOISE_PROBES, *self.image_size, 3)).astype(np.float32)
+
+    def _tflite_agreement(self, images: np.ndarray) -> float:
+        """Part des images où TFLite et Keras prédisent la même classe (top-1).
+        Une sortie TFLite constante (entrée saturée) ne compte pas comme une prédiction."""
+        expected = self._infer(images).numpy().argmax(axis=1)
+        preds = self._predict_tflite(images)
+        agree = (preds.argmax(axis=1) == expected) & (np.ptp(preds, axis=1) > 0)
+        return float(np.mean(agree))
+
+    def _make_infer(self):
+        # appel direct du modèle dans un graphe tracé une fois : évite la mise en place
+        # de model.predict (adaptateur de données, callbacks) à chaque image ;
+        # XLA fusionne les blocs conv + BN + activation d'EfficientNet
+        model = self.model
+
+        @tf.function(
+            jit_compile=XLA_INFERENCE,
+            input_signature=[tf.TensorSpec((None, *self.image_size, 3), tf.float32)],
+        )
+        def infer(x):
+            return model(x, training=False)
+
+        return infer
+
+    def _run_model(self, x: np.ndarray) -> np.ndarray:
+        if self.onnx_session is not None:
+            return self.onnx_session.run(None, {self.onnx_session.get_inputs()[0].name: x})[0]
+        if self.interpreter is not None:
+            return self._predict_tflite(x)
+        return self._infer(x).numpy()
+
     # -----------------------------------------------------------------
     # Prédiction
     # -----------------------------------------------------------------
-    def predict(
-        self,
-        image: Union[str, Path, Image.Image],
-        language: str = "fr",
-        topk: int = 3,
-    ) -> Dict[str, Any]:
+    def _prediction_args(self, language: str, topk: int) -> Tuple[str, int]:
         if not self.is_loaded or self.model is None:
             raise RuntimeError("Modèle non chargé")
 
         if language not in ("fr", "wo", "pu"):
             language = "fr"
 
-        if topk < 1:
-            topk = 1
+        return language, max(topk, 1)
+
+    def predict(
+        self,
+        image: Union[str, Path, Image.Image],
+        language: str = "fr",
+        topk: int = 3,
+    ) -> Dict[str, Any]:
+        language, topk = self._prediction_args(language, topk)
 
         try:
-            x = self.preprocess_image(image)
-            preds = self.model.predict(x, verbose=0)
-            probs = preds[0]
-
-            # top-k indices
-            top_indices = np.argsort(probs)[::-1][:topk]
-            top_predictions: List[Dict[str, Any]] = []
-
-            for idx in top_indices:
-                raw_label, norm_key = self._get_safe_class_name(idx)
-                conf = float(probs[idx])
-                top_predictions.append(
-                    {
-                        "disease": self._name_localized(norm_key, language)
-                        if norm_key != "unknown"
-                        else raw_label.replace("_", " "),
-                        "confidence": conf,
-                        "severity": DISEASE_INFO.get(norm_key, {}).get("severity", "Inconnue"),
-                        "disease_key": norm_key,
-                        "raw_label": raw_label,
-                    }
-                )
-
-            # meilleure prédiction
-            best_idx = top_indices[0]
-            best_raw, best_key = self._get_safe_class_name(best_idx)
-            best_conf = float(probs[best_idx])
-
-            if best_key == "unknown":
-                display_name = (best_raw or "Maladie non identifiée").replace("_", " ")
-            else:
-                display_name = self._name_localized(best_key, language)
-
-            meta = DISEASE_INFO.get(best_key, {})
-            result = {
-                "disease_key": best_key,
-                "disease_name": display_name,
-                "confidence": best_conf,
-                "severity": meta.get("severity", "Inconnue"),
-                "affected_crop": meta.get("crop", "Non spécifié"),
-                "treatments": self._treatments_localized(best_key, language),
-                "prevention_tips": meta.get("prevention", [])[:5],
-                "top_predictions": top_predictions,
-                "requires_action": ("healthy" not in best_key),
-                "timestamp": datetime.now().isoformat(),
-                "model_version": self.model_version,
-                "success": True,
-            }
-
-            logger.info(f"🔍 Prédiction: {result['disease_name']} ({best_conf:.2%})")
-            return result
+            x = self._input_buffer()
+            self._preprocess_into(image, x[0])
+            preds = self._run_model(x)
+            return self._build_result(preds[0], language, topk)
 
         except Exception as e:
             logger.error(f"❌ Erreur de prédiction: {e}")
-            return {
-                "error": str(e),
-                "disease_name": "Erreur de prédiction",
-                "confidence": 0.0,
-                "severity": "Inconnue",
-                "affected_crop": "Non spécifié",
-                "treatments": [],
-                "prevention_tips": [],
-                "timestamp": datetime.now().isoformat(),
-                "success": False,
-            }
+            return self._error_result(e)
+
+    def predict_batch(
+        self,
+        images: List[Union[str, Path, Image.Image]],
+        language: str = "fr",
+        topk: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """Analyse plusieurs images en une seule passe du modèle (un résultat par image)."""
+        language, topk = self._prediction_args(language, topk)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        # chaque image est écrite directement dans sa ligne du lot (pas de np.stack)
+        x = np.empty((len(images), *self.image_size, 3), dtype=np.float32)
+        positions: List[int] = []
+        for i, image in enumerate(images):
+            try:
+                self._preprocess_into(image, x[i])
+                positions.append(i)
+            except Exception as e:
+                results[i] = self._error_result(e)
+
+        if positions:
+            if len(positions) < len(images):
+                x = x[positions]
+            try:
+                preds = self._run_model(x)
+                for i, probs in zip(positions, preds):
+                    results[i] = self._build_result(probs, language, topk)
+            except Exception as e:
+                logger.error(f"❌ Erreur de prédiction (lot): {e}")
+                for i in positions:
+                    results[i] = self._error_result(e)
+
+        return results
+
+    def _build_result(self, probs: np.ndarray, language: str, topk: int) -> Dict[str, Any]:
+        # top-k indices : sélection O(C) puis tri des k retenus seulement
+        k = min(topk, probs.shape[-1])
+        part = np.argpartition(probs, -k)[-k:]
+        top_indices = part[np.argsort(probs[part], kind="stable")[::-1]]
+        top_predictions: List[Dict[str, Any]] = []
+
+        # indices hors de class_names -> dernière case ("unknown") des tables
+        last = len(self._class_keys) - 1
+        slots = np.minimum(top_indices, last)
+        display = self._class_display[language]
+
+        for idx, slot in zip(top_indices, slots):
+            top_predictions.append(
+                {
+                    "disease": display[slot],
+                    "confidence": float(probs[idx]),
+                    "severity": self._class_severity[slot],
+                    "disease_key": self._class_keys[slot],
+                    "raw_label": self._class_labels[slot],
+                }
+            )
+
+        # meilleure prédiction
+        best = top_predictions[0]
+        best_key = best["disease_key"]
+        best_conf = best["confidence"]
+        display_name = best["disease"]
+
+        meta = DISEASE_INFO.get(best_key, {})
+        result = {
+            "disease_key": best_key,
+            "disease_name": display_name,
+            "confidence": best_conf,
+            "severity": meta.get("severity", "Inconnue"),
+            "affected_crop": meta.get("crop", "Non spécifié"),
+            "treatments": self._treatments_localized(best_key, language),
+            "prevention_tips": meta.get("prevention", [])[:5],
+            "top_predictions": top_predictions,
+            "requires_action": ("healthy" not in best_key),
+            "timestamp": datetime.now().isoformat(),
+            "model_version": self.model_version,
+            "success": True,
+        }
+
+        logger.info(f"🔍 Prédiction: {result['disease_name']} ({best_conf:.2%})")
+        return result
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        return {
+            "error": str(error),
+            "disease_name": "Erreur de prédiction",
+            "confidence": 0.0,
+            "severity": "Inconnue",
+            "affected_crop": "Non spécifié",
+            "treatments": [],
+            "prevention_tips": [],
+            "timestamp": datetime.now().isoformat(),
+            "success": False,
+        }
 
     # -----------------------------------------------------------------
     # Recharge à chaud
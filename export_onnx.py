@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Conversion du modèle AgriDetect en ONNX pour onnxruntime.
+
+Le fichier produit (model.onnx) est placé dans le dossier du modèle :
+app.py le charge en priorité avec onnxruntime (sans TensorFlow ni Keras),
+PlantDiseaseDetector aussi (TensorRT / CUDA si disponibles, sinon CPU).
+
+Exemple:
+  python export_onnx.py --model models/agridetect_model_20251107_042206
+"""
+
+from __future__ import annotations
+import argparse
+from pathlib import Path
+
+import tensorflow as tf
+import tf2onnx
+
+ONNX_MODEL_FILE = "model.onnx"
+IMG_SIZE = (224, 224)
+
+
+def load_keras_model(model_dir: Path) -> tf.keras.Model:
+    """model.keras / model.h5 si présents, sinon le SavedModel du dossier."""
+    for name in ("model.keras", "model.h5"):
+        candidate = model_dir / name
+        if candidate.exists():
+            return tf.keras.models.load_model(candidate, compile=False)
+    if (model_dir / "saved_model.pb").exists():
+        return tf.keras.models.load_model(model_dir, compile=False)
+    raise FileNotFoundError(f"Aucun modèle trouvé dans {model_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export ONNX du modèle AgriDetect")
+    parser.add_argument("--model", type=Path, required=True,
+                        help="Dossier du modèle (SavedModel, model.keras ou model.h5).")
+    parser.add_argument("--opset", type=int, default=17,
+                        help="Version d'opset ONNX (défaut: 17).")
+    args = parser.parse_args()
+
+    model = load_keras_model(args.model)
+    # Lot de taille variable : app.py analyse plusieurs images en une passe
+    spec = (tf.TensorSpec((None, *IMG_SIZE, 3), tf.float32, name="input"),)
+    output = args.model / ONNX_MODEL_FILE
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=args.opset,
+                               output_path=str(output))
+    print(f"✅ Modèle ONNX écrit: {output} ({output.stat().st_size / (1024 * 1024):.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Conversion du modèle AgriDetect en TFLite INT8 (quantification post-entraînement).
+
+Le fichier produit (model_int8.tflite) est placé dans le dossier du modèle :
+app.py le charge avec tf.lite.Interpreter pour l'inférence CPU
+(en priorité, sauf si un model.onnx est présent).
+
+Avec --raw-pixels, la calibration se fait sur les pixels bruts [0, 255]
+et produit model_int8_raw.tflite : c'est la version chargée par
+disease_detector.py (PlantDiseaseDetector), dont le modèle EfficientNet
+attend des pixels non normalisés.
+
+Chaque export INT8 enregistre aussi quelques images de calibration
+(tflite_check_samples.npy) : disease_detector.py s'en sert au chargement
+pour vérifier que la version TFLite donne les mêmes classes que Keras.
+
+Avec --fp16, produit model_fp16.tflite (poids en float16, sans calibration)
+pour les délégués GPU / mobile.
+
+Exemples:
+  python export_tflite.py --model models/agridetect_model_20251107_042206 --data data/train
+  python export_tflite.py --model models/agridetect_model_20251107_042206 --data data/train --samples 200
+  python export_tflite.py --model models/agridetect_model_20251107_042206 --data data/train --raw-pixels
+  python export_tflite.py --model models/agridetect_model_20251107_042206 --fp16
+"""
+
+from __future__ import annotations
+import argparse
+import random
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+from PIL import Image
+import tensorflow as tf
+
+TFLITE_MODEL_FILE = "model_int8.tflite"
+TFLITE_RAW_MODEL_FILE = "model_int8_raw.tflite"
+TFLITE_CHECK_FILE = "tflite_check_samples.npy"
+CHECK_SAMPLES = 16
+TFLITE_FP16_MODEL_FILE = "model_fp16.tflite"
+IMG_SIZE = (224, 224)
+IMG_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def collect_images(root: Path, limit: int) -> List[Path]:
+    """Sélectionne aléatoirement des images pour calibrer la quantification."""
+    images = [p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in IMG_EXTS]
+    random.shuffle(images)
+    return images[:limit]
+
+
+def representative_dataset(images: List[Path], scale: float = 1.0 / 255.0) -> Iterator[List[np.ndarray]]:
+    """Échantillons prétraités comme à l'inférence (RGB, 224x224, x scale : /255 pour app.py)."""
+    for path in images:
+        img = Image.open(path).convert("RGB").resize(IMG_SIZE, Image.BILINEAR)
+        arr = np.asarray(img, dtype=np.float32) * np.float32(scale)
+        yield [arr[np.newaxis, ...]]
+
+
+def load_pixels(images: List[Path]) -> np.ndarray:
+    """Pixels bruts uint8 (N, 224, 224, 3), redimensionnés comme pour la calibration."""
+    return np.stack([
+        np.asarray(Image.open(path).convert("RGB").resize(IMG_SIZE, Image.BILINEAR))
+        for path in images
+    ])
+
+
+def build_converter(model_dir: Path) -> tf.lite.TFLiteConverter:
+    """SavedModel si présent, sinon model.keras / model.h5."""
+    if (model_dir / "saved_model.pb").exists():
+        return tf.lite.TFLiteConverter.from_saved_model(str(model_dir))
+    for name in ("model.keras", "model.h5"):
+        candidate = model_dir / name
+        if candidate.exists():
+            model = tf.keras.models.load_model(candidate, compile=False)
+            return tf.lite.TFLiteConverter.from_keras_model(model)
+    raise FileNotFoundError(f"Aucun modèle trouvé dans {model_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export TFLite INT8 du modèle AgriDetect")
+    parser.add_argument("--model", type=Path, required=True,
+                        help="Dossier du modèle (SavedModel, model.keras ou model.h5).")
+    parser.add_argument("--data", type=Path,
+                        help="Dossier d'images pour la calibration INT8.")
+    parser.add_argument("--samples", type=int, default=100,
+                        help="Nombre d'images de calibration (défaut: 100).")
+    parser.add_argument("--raw-pixels", action="store_true",
+                        help="Calibration sur les pixels [0, 255] (disease_detector.py) au lieu de [0, 1].")
+    parser.add_argument("--fp16", action="store_true",
+                        help="Export float16 (GPU / mobile) au lieu de INT8.")
+    args = parser.parse_args()
+
+    if args.fp16:
+        converter = build_converter(args.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+        tflite_model = converter.convert()
+        output = args.model / TFLITE_FP16_MODEL_FILE
+        output.write_bytes(tflite_model)
+        print(f"✅ Modèle FP16 écrit: {output} ({len(tflite_model) / (1024 * 1024):.2f} MB)")
+        return
+
+    if args.data is None:
+        parser.error("--data est requis pour la calibration INT8")
+    images = collect_images(args.data, args.samples)
+    if not images:
+        raise SystemExit(f"❌ Aucune image de calibration trouvée dans {args.data}")
+    print(f"📸 {len(images)} images de calibration")
+
+    converter = build_converter(args.model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    scale = 1.0 if args.raw_pixels else 1.0 / 255.0
+    converter.representative_dataset = lambda: representative_dataset(images, scale)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    converter.inference_output_type = tf.uint8
+
+    tflite_model = converter.convert()
+    output = args.model / (TFLITE_RAW_MODEL_FILE if args.raw_pixels else TFLITE_MODEL_FILE)
+    output.write_bytes(tflite_model)
+    print(f"✅ Modèle INT8 écrit: {output} ({len(tflite_model) / (1024 * 1024):.2f} MB)")
+
+    check_output = args.model / TFLITE_CHECK_FILE
+    np.save(check_output, load_pixels(images[:CHECK_SAMPLES]))
+    print(f"✅ Images de contrôle écrites: {check_output}")
+
+
+if __name__ == "__main__":
+    main()